@@ -1,20 +1,29 @@
 from __future__ import annotations
 
+import ast
+import io
 import json
+import pickle
 import plistlib
+import struct
+import sys
 import unittest
+from contextlib import redirect_stdout
 from unittest import mock
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
 from vst_scanning_tool import (
     ManufacturerNormalizer,
+    PluginRecord,
     discover_windows_plugin_paths,
     scan_paths,
 )
 
 
-def _write_vst3_plugin(root: Path, name: str, manufacturer: str, identifier: str) -> Path:
+def _write_vst3_plugin(
+    root: Path, name: str, manufacturer: str, identifier: str, fmt=plistlib.FMT_XML, **extra
+) -> Path:
     bundle = root / f"{name}.vst3"
     info = bundle / "Contents" / "Info.plist"
     info.parent.mkdir(parents=True, exist_ok=True)
@@ -25,8 +34,10 @@ def _write_vst3_plugin(root: Path, name: str, manufacturer: str, identifier: str
                 "CFBundleIdentifier": identifier,
                 "AudioComponentManufacturer": manufacturer,
                 "CFBundleShortVersionString": "1.0.0",
+                **extra,
             },
             fh,
+            fmt=fmt,
         )
     return bundle
 
@@ -42,6 +53,44 @@ def _write_vst2_plugin(root: Path, filename: str, manufacturer: str, plugin_name
     return plugin
 
 
+def _version_node(key: str, value: bytes = b"", children: bytes = b"", text=False) -> bytes:
+    node = struct.pack("<HHH", 0, len(value) // 2 if text else len(value), int(text))
+    node += (key + "\0").encode("utf-16-le")
+    node += bytes(-len(node) % 4) + value
+    if children:
+        node += bytes(-len(node) % 4) + children
+    node = struct.pack("<H", len(node)) + node[2:]
+    return node + bytes(-len(node) % 4)
+
+
+def _pe_with_version_info(**strings) -> bytes:
+    """Minimal x64 PE whose only section holds an RT_VERSION resource."""
+    table = b"".join(_version_node(k, (v + "\0").encode("utf-16-le"), text=True) for k, v in strings.items())
+    info = _version_node(
+        "VS_VERSION_INFO", bytes(52), _version_node("StringFileInfo", children=_version_node("040904B0", children=table))
+    )
+    rsrc = (
+        struct.pack("<12xHHII", 0, 1, 16, 0x80000018)
+        + struct.pack("<12xHHII", 0, 1, 1, 0x80000030)
+        + struct.pack("<12xHHII", 0, 1, 0x409, 0x48)
+        + struct.pack("<IIII", 0x1058, len(info), 0, 0)
+        + info
+    )
+    header = bytearray(0x200)
+    header[:2] = b"MZ"
+    struct.pack_into("<I", header, 0x3C, 0x40)
+    struct.pack_into("<4sHH12xH", header, 0x40, b"PE\0\0", 0x8664, 1, 240)
+    struct.pack_into("<H", header, 0x58, 0x20B)
+    struct.pack_into("<I", header, 0x58 + 108, 16)
+    struct.pack_into("<II", header, 0x58 + 112 + 16, 0x1000, len(rsrc))
+    struct.pack_into("<8sIIII", header, 0x58 + 240, b".rsrc", len(rsrc), 0x1000, len(rsrc), 0x200)
+    return bytes(header) + rsrc
+
+
+def _failing_worker_init(*args) -> None:
+    raise RuntimeError("worker init failed")
+
+
 class ScannerTests(unittest.TestCase):
     def test_vst3_metadata_and_normalization(self):
         with TemporaryDirectory() as tmpdir:
@@ -58,6 +107,38 @@ class ScannerTests(unittest.TestCase):
             self.assertEqual(record.version, "1.0.0")
             self.assertEqual(record.path, vst3)
 
+    def test_binary_and_large_plists(self):
+        with TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            _write_vst3_plugin(root, "EchoBoy", "Soundtoys", "com.soundtoys.echoboy", fmt=plistlib.FMT_BINARY)
+            _write_vst3_plugin(
+                root, "Gullfoss", "2CAudio", "com.soundtheory.gullfoss", CFBundleIconData=bytes(256 * 1024)
+            )
+
+            records = {r.name: r for r in scan_paths([root])}
+            self.assertEqual(set(records), {"EchoBoy", "Gullfoss"})
+            self.assertEqual(records["EchoBoy"].identifier, "com.soundtoys.echoboy")
+            self.assertEqual(records["Gullfoss"].version, "1.0.0")
+
+    def test_latin1_xml_plist(self):
+        with TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            info = root / "Cafe.vst3" / "Contents" / "Info.plist"
+            info.parent.mkdir(parents=True)
+            info.write_bytes(
+                b'<?xml version="1.0" encoding="ISO-8859-1"?>\n<plist version="1.0"><dict>'
+                b"<key>CFBundleName</key><string>Caf\xe9</string>"
+                b"<key>CFBundleIdentifier</key><string>com.example.cafe</string>"
+                b"<key>AudioComponentManufacturer</key><string>Soundtoys</string>"
+                b"</dict></plist>"
+            )
+
+            records = scan_paths([root])
+            self.assertEqual(len(records), 1)
+            self.assertEqual(records[0].name, "Caf\xe9")
+            self.assertEqual(records[0].identifier, "com.example.cafe")
+            self.assertEqual(records[0].manufacturer, "Soundtoys")
+
     def test_deduplicates_duplicates(self):
         with TemporaryDirectory() as tmpdir:
             root = Path(tmpdir)
@@ -89,6 +170,75 @@ class ScannerTests(unittest.TestCase):
             self.assertEqual(records[0].manufacturer, "Acustica Audio")
             self.assertEqual(records[0].name, "Aquarius")
 
+    def test_plain_json_sidecar_found_by_walk(self):
+        with TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            plugin = root / "Decapitator.dll"
+            plugin.touch()
+            (root / "Decapitator.dll.json").write_text(
+                json.dumps({"name": "Decapitator", "manufacturer": "Soundtoys", "version": "5.4"}),
+                encoding="utf-8",
+            )
+
+            records = scan_paths([root])
+            self.assertEqual(len(records), 1)
+            self.assertEqual(records[0].manufacturer, "Soundtoys")
+            self.assertEqual(records[0].version, "5.4")
+
+    def test_walk_finds_nested_plugins_without_entering_bundles(self):
+        with TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            bundle = _write_vst3_plugin(root / "Vendor", "Pro-Q 3", "FabFilter", "com.fabfilter.proq3")
+            binary = bundle / "Contents" / "x86_64-win" / "Pro-Q 3.vst3"
+            binary.parent.mkdir(parents=True)
+            binary.touch()
+            nested = root / "Vendor" / "Legacy"
+            nested.mkdir()
+            _write_vst2_plugin(nested, "Aquarius.dll", "acustica audio", "Aquarius")
+            for skipped in ("__MACOSX", ".Trash"):
+                (root / skipped).mkdir()
+                _write_vst2_plugin(root / skipped, "Copy.dll", "Nobody", "Copy")
+
+            records = scan_paths([root])
+            self.assertEqual(sorted(r.name for r in records), ["Aquarius", "Pro Q 3"])
+            self.assertEqual(
+                {r.path for r in records},
+                {bundle, nested / "Aquarius.dll"},
+            )
+
+    def test_bundle_passed_directly_is_not_walked(self):
+        with TemporaryDirectory() as tmpdir:
+            bundle = _write_vst3_plugin(Path(tmpdir), "Pro-Q 3", "FabFilter", "com.fabfilter.proq3")
+            binary = bundle / "Contents" / "x86_64-win" / "Pro-Q 3 (x64).vst3"
+            binary.parent.mkdir(parents=True)
+            binary.touch()
+
+            records = scan_paths([bundle])
+            self.assertEqual([r.path for r in records], [bundle])
+
+
+class NormalizerTests(unittest.TestCase):
+    def test_multi_word_alias_inside_longer_manufacturer(self):
+        normalizer = ManufacturerNormalizer()
+        self.assertEqual(normalizer.normalize_manufacturer("Plugin Alliance GmbH"), "Plugin Alliance")
+        self.assertEqual(normalizer.normalize_manufacturer("Acustica Audio srl"), "Acustica Audio")
+        self.assertEqual(normalizer.normalize_manufacturer("Xbox"), "Xbox")
+
+    def test_near_duplicate_merging_is_opt_in(self):
+        def records():
+            return [
+                PluginRecord("Pro-Q 3", "FabFilter", "VST3", Path("a/Pro-Q 3.vst3")),
+                PluginRecord("ProQ3", "FabFilter", "VST3", Path("b/ProQ3.vst3"), version="3.2"),
+                PluginRecord("Pro-Q 2", "FabFilter", "VST3", Path("a/Pro-Q 2.vst3")),
+            ]
+
+        normalizer = ManufacturerNormalizer()
+        self.assertEqual(len(normalizer.deduplicate(records())), 3)
+
+        merged = normalizer.deduplicate(records(), near_duplicate=True)
+        self.assertEqual(sorted(r.name for r in merged), ["Pro Q 2", "Pro Q 3"])
+        self.assertEqual(next(r for r in merged if r.name == "Pro Q 3").version, "3.2")
+
 
 class WindowsPathDiscoveryTests(unittest.TestCase):
     def test_discovery_is_noop_on_non_windows(self):
@@ -96,5 +246,153 @@ class WindowsPathDiscoveryTests(unittest.TestCase):
             self.assertEqual(discover_windows_plugin_paths(), [])
 
 
+class VstscanDataTests(unittest.TestCase):
+    def test_manufacturer_tables_have_no_duplicate_keys(self):
+        # Parsed rather than imported: a dict literal silently collapses duplicates.
+        source = Path(__file__).resolve().parents[1] / "vst_scanning_tool" / "vstscan.py"
+        tables = {}
+        for node in ast.parse(source.read_text(encoding="utf-8")).body:
+            if isinstance(node, ast.AnnAssign) and isinstance(node.value, ast.Dict):
+                keys = [key.value for key in node.value.keys]
+                tables[node.target.id] = keys
+                duplicates = sorted({key for key in keys if keys.count(key) > 1})
+                self.assertEqual(duplicates, [], node.target.id)
+
+        self.assertLessEqual(set(tables["AMBIGUOUS_PLUGIN_NAMES"]), set(tables["PLUGIN_NAME_TO_MANUFACTURER"]))
+
+    def test_vendor_names_are_interned(self):
+        with redirect_stdout(io.StringIO()):  # pefile warning on import
+            from vst_scanning_tool import vstscan
+
+        names = vstscan.PLUGIN_NAME_TO_MANUFACTURER
+        self.assertIs(names["ozone"], names["neutron"])
+        self.assertIs(names["valhalla"], sys.intern("Valhalla DSP"))
+        self.assertIn("valhallaroom", vstscan.VENDOR_TO_KEYS["Valhalla DSP"])
+
+    def test_short_keys_match_whole_words_only(self):
+        with redirect_stdout(io.StringIO()):
+            from vst_scanning_tool import vstscan
+
+        db = vstscan.VSTDatabase()
+        self.assertEqual(db.match_name("RX 10 De-click"), "iZotope")
+        self.assertEqual(db.match_name("brainworx"), "Plugin Alliance")
+        self.assertEqual(db.match_name("MReverb"), "MeldaProduction")
+        # distinctive codes still match inside longer names, and digit or
+        # CamelCase transitions count as word boundaries
+        self.assertEqual(db.match_name("DC1A3"), "Klanghelm")
+        self.assertEqual(db.match_name("MJUCjr"), "Klanghelm")
+        self.assertEqual(db.match_name("L1Ultra"), "Waves")
+        self.assertEqual(db.match_name("RX10 Connect"), "iZotope")
+        self.assertEqual(db.match_name("MasterRig"), "Acon Digital")
+
+    def test_all_caps_names_split_on_separators_and_digits_only(self):
+        with redirect_stdout(io.StringIO()):
+            from vst_scanning_tool import vstscan
+
+        db = vstscan.VSTDatabase()
+        # without case there is no CamelCase hint, so generic words and short
+        # codes need a separator or a letter/digit transition
+        self.assertEqual(db.match_name("PUNCH BX1"), "Rob Papen")
+        self.assertIsNone(db.match_name("PUNCHBX1-T49WYS"))
+        self.assertEqual(db.match_name("MASTER RIG"), "Acon Digital")
+        self.assertIsNone(db.match_name("MASTERRIG"))
+        self.assertEqual(db.match_name("BRAINWORX"), "Plugin Alliance")
+        self.assertEqual(db.match_name("RX10 CONNECT"), "iZotope")
+        self.assertEqual(db.match_name("L1ULTRA"), "Waves")
+        # distinctive codes are unaffected
+        self.assertEqual(db.match_name("MJUCJR"), "Klanghelm")
+
+    def test_first_manufacturer_pattern_wins(self):
+        with redirect_stdout(io.StringIO()):
+            from vst_scanning_tool import vstscan
+
+        db = vstscan.VSTDatabase()
+        # the earlier table entry wins regardless of where it occurs in the text
+        self.assertEqual(db.match_pattern("Waves Auto-Tune Access"), "Antares")
+        self.assertEqual(db.match_pattern("SSL Channel by Waves"), "Waves")
+        # regex-only patterns (psp*, tal-) keep their place in the order too
+        self.assertEqual(db.match_pattern("PSPaudioware / Waves"), "Waves")
+        self.assertEqual(db.match_pattern("TAL-NoiseMaker u-he"), "u-he")
+
+    def test_first_binary_pattern_wins(self):
+        with redirect_stdout(io.StringIO()):
+            from vst_scanning_tool import vstscan
+
+        db = vstscan.VSTDatabase()
+        # brands appear in reverse table order; the table order decides
+        self.assertEqual(db.search_binary(b"\x00Waves\x00..\x00FabFilter\x00"), "FabFilter")
+        self.assertEqual(db.search_binary(b"\x00Valhalla DSP\x00iZotope\x00"), "iZotope")
+        self.assertEqual(db.search_binary(b"\x00Waves Audio\x00Antares\x00"), "Antares")
+
+    def test_meta_cache_drops_malformed_entries(self):
+        with redirect_stdout(io.StringIO()):
+            from vst_scanning_tool import vstscan
+
+        with TemporaryDirectory() as tmp:
+            cache_file = Path(tmp) / "meta.json"
+            cache_file.write_text(json.dumps({
+                "a.dll|1|2": {"CompanyName": "FabFilter"},
+                "b.dll|1|2": "junk",
+                "c.dll|1|2": None,
+            }), encoding="utf-8")
+            scanner = vstscan.VSTScanner(cache_file=cache_file)
+            self.assertEqual(scanner._meta_cache,
+                             {"a.dll|1|2": {"CompanyName": "FabFilter"}})
+
+    def test_pe_metadata_skips_stat_without_cache(self):
+        with redirect_stdout(io.StringIO()):
+            from vst_scanning_tool import vstscan
+
+        scanner = vstscan.VSTScanner()
+        path = mock.MagicMock(spec=Path)
+        with mock.patch.object(scanner, "_read_pe_metadata", return_value={}) as read:
+            self.assertEqual(scanner._extract_pe_metadata(path), {})
+        path.stat.assert_not_called()
+        read.assert_called_once_with(path, None)
+
+    def test_worker_reuses_parent_database(self):
+        with redirect_stdout(io.StringIO()):
+            from vst_scanning_tool import vstscan
+
+        db = pickle.loads(pickle.dumps(vstscan.VSTDatabase()))
+        self.assertEqual(db.match_pattern("SSL Channel by Waves"), "Waves")
+        self.assertEqual(db.clean_manufacturer("FabFilter Software Instruments"), "FabFilter")
+        self.assertEqual(db.match_name("Pro-Q 3"), "FabFilter")
+
+        with mock.patch.object(vstscan.VSTScanner, "_get_all_vst3_paths") as vst3, \
+                mock.patch.object(vstscan.VSTScanner, "_get_all_vst2_paths") as vst2:
+            vstscan._init_worker(db, False, None, {"k": {}})
+        vst3.assert_not_called()
+        vst2.assert_not_called()
+        self.assertIs(vstscan._worker_scanner.db, db)
+        self.assertEqual(vstscan._worker_scanner._meta_cache, {"k": {}})
+
+    def test_scan_falls_back_when_pool_breaks(self):
+        with redirect_stdout(io.StringIO()):
+            from vst_scanning_tool import vstscan
+
+        with TemporaryDirectory() as tmpdir:
+            dll = Path(tmpdir) / "Zzqx.dll"
+            dll.write_bytes(_pe_with_version_info(CompanyName="FabFilter", ProductName="Zzqx"))
+            scanner = vstscan.VSTScanner()
+            out = io.StringIO()
+            with mock.patch.object(vstscan, "_init_worker", _failing_worker_init), \
+                    mock.patch.object(scanner, "_discover_files", return_value=[(dll, "VST2", False)]), \
+                    redirect_stdout(out):
+                scanner.scan_all_plugins(max_workers=1)
+
+        self.assertIn("Пул процессов недоступен", out.getvalue())
+        self.assertEqual([(p.manufacturer, p.name) for p in scanner.plugins], [("FabFilter", "Zzqx")])
+
+    def test_version_info_strings_without_pefile(self):
+        with redirect_stdout(io.StringIO()):
+            from vst_scanning_tool import vstscan
+
+        data = _pe_with_version_info(CompanyName="FabFilter", ProductName="Pro-Q 3", Comments=" ")
+        self.assertEqual(vstscan._read_version_strings(data), {"CompanyName": "FabFilter", "ProductName": "Pro-Q 3"})
+        self.assertEqual(vstscan.VSTScanner._get_pe_architecture(data), "x64")
+        self.assertIsNone(vstscan._read_version_strings(b"MZ"))
+
+
 if __name__ == "__main__":
     unittest.main()
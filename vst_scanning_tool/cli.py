@@ -23,6 +23,11 @@ def _parse_args(argv: List[str]) -> argparse.Namespace:
         action="store_true",
         help="Also scan standard Windows VST locations in addition to any provided paths.",
     )
+    parser.add_argument(
+        "--merge-near-duplicates",
+        action="store_true",
+        help="Also merge plugins whose names differ only in spelling (e.g. 'Pro-Q 3' and 'ProQ3').",
+    )
     return parser.parse_args(argv)
 
 
@@ -39,7 +44,7 @@ def main(argv: List[str] | None = None) -> int:
         raise SystemExit("No plugin paths were provided and no default Windows paths were found.")
 
     normalizer = ManufacturerNormalizer()
-    records = scan_paths(targets, normalizer=normalizer)
+    records = scan_paths(targets, normalizer=normalizer, near_duplicate=args.merge_near_duplicates)
     write_text_report(records, args.output)
     return 0
 
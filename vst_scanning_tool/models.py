@@ -5,7 +5,7 @@ from pathlib import Path
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class PluginRecord:
     """Represents a single plugin instance discovered during scanning."""
 
@@ -15,40 +15,66 @@ class PluginRecord:
     path: Path
     identifier: Optional[str] = None
     version: Optional[str] = None
-    extra: dict = field(default_factory=dict)
+    extra: Optional[dict] = None
+    # (name, manufacturer, plugin_type, key, manufacturer_len, name_len) for
+    # the field values it was computed from; see ``_normalized``.
+    _cached_key: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
 
     def key(self) -> tuple[str, str, str]:
         """Generate a stable key for deduplication."""
-        normalized_name = _clean(self.name)
-        normalized_manufacturer = _clean(self.manufacturer)
-        normalized_type = self.plugin_type.upper()
-        return normalized_type, normalized_manufacturer, normalized_name
+        return self._normalized()[3]
 
     def merge(self, other: "PluginRecord") -> "PluginRecord":
         """Merge metadata from another record, preferring richer data."""
+        # Exact duplicates (the same plugin reached via two search paths)
+        # have nothing to contribute.
+        if (
+            self.identifier
+            and self.version
+            and not other.extra
+            and other.name == self.name
+            and other.manufacturer == self.manufacturer
+        ):
+            return self
         if self.identifier is None and other.identifier:
             self.identifier = other.identifier
         if self.version is None and other.version:
             self.version = other.version
 
         # Prefer populated manufacturer/name info from the richer record.
-        if _is_richer_text(other.manufacturer, self.manufacturer):
+        mine = self._normalized()
+        theirs = other._normalized()
+        if _is_richer_text(other.manufacturer, theirs[4], self.manufacturer, mine[4]):
             self.manufacturer = other.manufacturer
-        if _is_richer_text(other.name, self.name):
+        if _is_richer_text(other.name, theirs[5], self.name, mine[5]):
             self.name = other.name
 
         # Combine paths and auxiliary data.
-        self.extra = {**other.extra, **self.extra}
+        if other.extra:
+            self.extra = {**other.extra, **(self.extra or {})}
         return self
 
+    def _normalized(self) -> tuple:
+        """Return the cached key and stripped lengths, refreshed when a key field is reassigned."""
+        cached = self._cached_key
+        if (
+            cached is None
+            or cached[0] is not self.name
+            or cached[1] is not self.manufacturer
+            or cached[2] is not self.plugin_type
+        ):
+            stripped_manufacturer = self.manufacturer.strip()
+            stripped_name = self.name.strip()
+            key = (self.plugin_type.upper(), stripped_manufacturer.lower(), stripped_name.lower())
+            cached = (self.name, self.manufacturer, self.plugin_type, key, len(stripped_manufacturer), len(stripped_name))
+            self._cached_key = cached
+        return cached
 
-def _clean(value: str) -> str:
-    return value.strip().lower()
 
-
-def _is_richer_text(candidate: str, current: str) -> bool:
+def _is_richer_text(candidate: str, candidate_len: int, current: str, current_len: int) -> bool:
+    """Compare two values by their pre-computed stripped lengths."""
     if not candidate:
         return False
     if not current:
         return True
-    return len(candidate.strip()) > len(current.strip())
+    return candidate_len > current_len
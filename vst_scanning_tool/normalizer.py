@@ -1,8 +1,28 @@
 from __future__ import annotations
 
+import functools
+import hashlib
+import random
 import re
 from dataclasses import dataclass
-from typing import Dict, Iterable, Optional
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# MinHash/LSH settings for the optional near-duplicate pass. 64 permutations
+# are split into 8 bands of 8 rows; every candidate pair that shares a band is
+# then checked against the exact 3-gram Jaccard similarity.
+NEAR_DUPLICATE_THRESHOLD = 0.85
+_MINHASH_PERMUTATIONS = 64
+_LSH_ROWS = 8
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_PERMUTATIONS: Tuple[Tuple[int, int], ...] = tuple(
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(_MINHASH_PERMUTATIONS)
+)
+del _rng
+_NON_ALNUM_RE = re.compile(r"[\W_]+")
+_DIGITS_RE = re.compile(r"\d+")
+_DEDUP_BATCH = 1024
 
 
 @dataclass(frozen=True)
@@ -15,6 +35,9 @@ class NormalizedIdentity:
 class ManufacturerNormalizer:
     """Normalizes manufacturer and plugin names to reduce duplicates."""
 
+    _WHITESPACE_RE = re.compile(r"\s+")
+    _SEPARATOR_RE = re.compile(r"[_-]+")
+
     def __init__(self, extra_aliases: Optional[Dict[str, str]] = None) -> None:
         aliases = {
             "sonible": "Sonible",
@@ -32,33 +55,41 @@ class ManufacturerNormalizer:
         self.aliases: Dict[str, str] = {k.lower(): v for k, v in aliases.items()}
         if extra_aliases:
             self.aliases.update({k.lower(): v for k, v in extra_aliases.items()})
+        self._alias_re = _compile_alias_pattern(self.aliases)
+        # Libraries repeat a handful of vendors thousands of times; the
+        # alias resolution only depends on the manufacturer string.
+        self._resolve_manufacturer = functools.lru_cache(maxsize=4096)(self._resolve_manufacturer)
 
     def normalize_manufacturer(self, manufacturer: str, plugin_name: Optional[str] = None) -> str:
-        candidate = (manufacturer or "").strip()
-        lowered = candidate.lower()
-
         # Heuristics based on plugin naming conventions.
         if plugin_name:
-            if plugin_name.lower().startswith("bx_"):
+            lowered_name = plugin_name.lower()
+            if lowered_name.startswith("bx_"):
                 return "Brainworx (Plugin Alliance)"
-            if "sonible" in plugin_name.lower():
+            if "sonible" in lowered_name:
                 return "Sonible"
 
+        return self._resolve_manufacturer(manufacturer)
+
+    def _resolve_manufacturer(self, manufacturer: str) -> str:
+        candidate = (manufacturer or "").strip()
+        lowered = candidate.lower()
+
         if lowered in self.aliases:
             return self.aliases[lowered]
 
-        # Attempt to split on known separators to salvage a meaningful name.
-        for token in re.split(r"[\s|/-]+", candidate):
-            token_lower = token.lower()
-            if token_lower in self.aliases:
-                return self.aliases[token_lower]
+        # Look for known aliases between separators to salvage a meaningful
+        # name. The longest alias wins, so "Plugin Alliance GmbH" still
+        # resolves through the multi-word "plugin alliance" alias.
+        best = max(self._alias_re.findall(lowered), key=len, default=None)
+        if best:
+            return self.aliases[best]
 
         return candidate or "Unknown"
 
     def normalize_plugin_name(self, plugin_name: str) -> str:
-        plugin_name = plugin_name.strip()
-        cleaned = re.sub(r"\s+", " ", plugin_name)
-        cleaned = re.sub(r"[_-]+", " ", cleaned)
+        cleaned = self._WHITESPACE_RE.sub(" ", plugin_name.strip())
+        cleaned = self._SEPARATOR_RE.sub(" ", cleaned)
         cleaned = cleaned.replace("®", "").strip()
         return cleaned or "Unknown Plugin"
 
@@ -71,18 +102,130 @@ class ManufacturerNormalizer:
             plugin_type=plugin_type.upper(),
         )
 
-    def deduplicate(self, records: Iterable["PluginRecord"]):
+    def normalize_batch(
+        self, manufacturers: List[str], names: List[str], types: List[str]
+    ) -> Tuple[List[str], List[str], List[str]]:
+        """Column-wise ``identity``: normalize parallel lists of manufacturers, names and types."""
+
+        normalize_manufacturer = self.normalize_manufacturer
+        normalize_name = self.normalize_plugin_name
+
+        normalized_manufacturers = [normalize_manufacturer(m, n) for m, n in zip(manufacturers, names)]
+        normalized_names = [normalize_name(n) for n in names]
+        normalized_types = [t.upper() for t in types]
+        return normalized_manufacturers, normalized_names, normalized_types
+
+    def deduplicate(self, records: Iterable["PluginRecord"], near_duplicate: bool = False):
+        """Merge records that share a normalized identity.
+
+        With ``near_duplicate`` enabled, records of the same type whose
+        ``manufacturer + name`` are near-identical (e.g. "Pro-Q 3" and
+        "ProQ3") are merged as well.
+        """
+
         from .models import PluginRecord
 
-        deduped: Dict[tuple[str, str, str], PluginRecord] = {}
-        for record in records:
-            identity = self.identity(record.manufacturer, record.name, record.plugin_type)
-            record.manufacturer = identity.manufacturer
-            record.name = identity.plugin_name
-            record.plugin_type = identity.plugin_type
-            key = (identity.plugin_type, identity.manufacturer.lower(), identity.plugin_name.lower())
-            if key not in deduped:
-                deduped[key] = record
-            else:
-                deduped[key].merge(record)
+        deduped: Dict[bytes, PluginRecord] = {}
+        # Records are folded in fixed-size batches, so a streamed scan never
+        # holds more than one batch plus the unique records in memory.
+        records = iter(records)
+        while True:
+            batch = list(islice(records, _DEDUP_BATCH))
+            if not batch:
+                break
+            manufacturers, names, types = self.normalize_batch(
+                [record.manufacturer for record in batch],
+                [record.name for record in batch],
+                [record.plugin_type for record in batch],
+            )
+            keys = [identity_digest(t, m.lower(), n.lower()) for t, m, n in zip(types, manufacturers, names)]
+            for record, manufacturer, name, plugin_type, key in zip(batch, manufacturers, names, types, keys):
+                record.manufacturer = manufacturer
+                record.name = name
+                record.plugin_type = plugin_type
+                if key not in deduped:
+                    deduped[key] = record
+                else:
+                    deduped[key].merge(record)
+        if near_duplicate:
+            return _merge_near_duplicates(list(deduped.values()))
         return list(deduped.values())
+
+
+def identity_digest(plugin_type: str, manufacturer_key: str, name_key: str) -> bytes:
+    """Return a 16-byte SHA-256 prefix identifying a normalized plugin.
+
+    Unlike ``hash()`` on a tuple, the digest is stable across runs and
+    processes, so it can be stored and compared between scans.
+    """
+
+    payload = f"{plugin_type}\x00{manufacturer_key}\x00{name_key}".encode("utf-8")
+    return hashlib.sha256(payload).digest()[:16]
+
+
+def _merge_near_duplicates(records: List["PluginRecord"]) -> List["PluginRecord"]:
+    """Fold near-identical records into the first one seen, using MinHash-LSH buckets."""
+
+    kept: List["PluginRecord"] = []
+    shingle_sets: List[Set[str]] = []
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+    for record in records:
+        shingles = _shingles(f"{record.manufacturer} {record.name}")
+        signature = _minhash(shingles)
+        bands = [
+            (start, signature[start:start + _LSH_ROWS]) for start in range(0, _MINHASH_PERMUTATIONS, _LSH_ROWS)
+        ]
+
+        target = None
+        seen: Set[int] = set()
+        for band in bands:
+            for index in buckets.get(band, ()):
+                if index in seen:
+                    continue
+                seen.add(index)
+                if _is_near_duplicate(record, shingles, kept[index], shingle_sets[index]):
+                    target = index
+                    break
+            if target is not None:
+                break
+
+        if target is not None:
+            kept[target].merge(record)
+            continue
+        for band in bands:
+            buckets.setdefault(band, []).append(len(kept))
+        kept.append(record)
+        shingle_sets.append(shingles)
+    return kept
+
+
+def _is_near_duplicate(record, shingles: Set[str], other, other_shingles: Set[str]) -> bool:
+    if record.plugin_type != other.plugin_type:
+        return False
+    # Version numbers tell products apart ("Pro-Q 2" vs "Pro-Q 3"), so they must agree.
+    if _DIGITS_RE.findall(record.name) != _DIGITS_RE.findall(other.name):
+        return False
+    union = len(shingles | other_shingles)
+    return union > 0 and len(shingles & other_shingles) / union >= NEAR_DUPLICATE_THRESHOLD
+
+
+def _shingles(text: str) -> Set[str]:
+    compact = _NON_ALNUM_RE.sub("", text.lower())
+    if len(compact) < 3:
+        return {compact}
+    return {compact[i:i + 3] for i in range(len(compact) - 2)}
+
+
+def _minhash(shingles: Set[str]) -> Tuple[int, ...]:
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+        for shingle in shingles
+    ]
+    return tuple(min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def _compile_alias_pattern(aliases: Iterable[str]) -> re.Pattern:
+    """Compile every alias into one alternation bounded by name separators."""
+
+    alternation = "|".join(re.escape(alias) for alias in sorted(aliases, key=len, reverse=True))
+    return re.compile(rf"(?<![^\s|/-])(?:{alternation})(?![^\s|/-])")
@@ -1,48 +1,158 @@
 from __future__ import annotations
 
-import json
+import os
 import plistlib
+import re
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from html import unescape
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Deque, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 from .models import PluginRecord
 from .normalizer import ManufacturerNormalizer
 
 SUPPORTED_EXTENSIONS = {".vst3", ".vst", ".dll"}
-
-
-def scan_paths(paths: Iterable[Path], *, normalizer: Optional[ManufacturerNormalizer] = None) -> List[PluginRecord]:
+_SUPPORTED_SUFFIXES = tuple(SUPPORTED_EXTENSIONS)
+_SIDECAR_SUFFIXES = (".metadata.json", ".json")
+# Archive/OS metadata folders that only ever hold copies or resource forks.
+_SKIPPED_DIRS = frozenset({"__macosx"})
+
+_INSPECT_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+
+_BINARY_PLIST_MAGIC = b"bplist00"
+_LARGE_PLIST_BYTES = 64 * 1024
+_PLIST_DATA_RE = re.compile(rb"<data>[^<]*</data>")
+_PLIST_KEYS_RE = re.compile(
+    rb"<key>(CFBundleName|CFBundleDisplayName|CFBundleIdentifier|AudioComponentManufacturer|Manufacturer"
+    rb"|CFBundleShortVersionString)</key>\s*<string>([^<]*)</string>"
+)
+_XML_ENCODING_RE = re.compile(rb"<\?xml[^>]*encoding=[\"']([A-Za-z0-9._-]+)[\"']")
+_UTF8_ENCODINGS = {b"utf-8", b"utf8"}
+
+
+def scan_paths(
+    paths: Iterable[Path],
+    *,
+    normalizer: Optional[ManufacturerNormalizer] = None,
+    near_duplicate: bool = False,
+) -> List[PluginRecord]:
     """Scan directories/files and return a list of PluginRecord entries."""
 
     normalizer = normalizer or ManufacturerNormalizer()
-    records: List[PluginRecord] = []
+    # Inspection is independent per plugin and mostly waits on disk, so the
+    # reads of many plugins overlap. Results come back in discovery order,
+    # which keeps the deduplicated output deterministic, and are folded into
+    # the dedup table as they arrive instead of being collected first.
+    with ThreadPoolExecutor(max_workers=_INSPECT_WORKERS) as pool:
+        records = _map_ordered(pool, _inspect_plugin, _iter_candidates(paths), _INSPECT_WORKERS * 4)
+        return normalizer.deduplicate(
+            (record for record in records if record), near_duplicate=near_duplicate
+        )
+
+
+def _iter_candidates(paths: Iterable[Path]) -> Iterator[Tuple[Path, Optional[Tuple[str, ...]], bool]]:
+    """Yield ``(plugin_path, sidecar_paths, is_dir)`` for every plugin under ``paths``.
+
+    ``sidecar_paths`` is ``None`` for explicitly passed plugins, meaning the
+    sidecar locations have to be tried one by one. ``is_dir`` is already known
+    from the listing (or the root check), so inspection never stats again.
+    """
+
     for raw_path in paths:
         path = Path(raw_path)
         if path.is_dir():
             if path.suffix.lower() in SUPPORTED_EXTENSIONS:
-                record = _inspect_plugin(path)
-                if record:
-                    records.append(record)
-            for candidate in path.rglob("*"):
-                if candidate.suffix.lower() in SUPPORTED_EXTENSIONS:
-                    record = _inspect_plugin(candidate)
-                    if record:
-                        records.append(record)
+                # A bundle passed directly is a plugin; its Contents tree is
+                # not walked, just like bundles found below a root.
+                yield path, None, True
+                continue
+            for candidate, is_dir, sidecars in _iter_plugins(str(path)):
+                yield Path(candidate), sidecars, is_dir
         elif path.suffix.lower() in SUPPORTED_EXTENSIONS:
-            record = _inspect_plugin(path)
-            if record:
-                records.append(record)
-    return normalizer.deduplicate(records)
-
-
-def _inspect_plugin(path: Path) -> Optional[PluginRecord]:
+            yield path, None, False
+
+
+def _map_ordered(pool: ThreadPoolExecutor, fn, items: Iterable[tuple], window: int) -> Iterator:
+    """Like ``pool.map(fn, *zip(*items))`` but with at most ``window`` tasks in flight.
+
+    ``Executor.map`` submits the whole input up front, which would buffer
+    every result of a large scan before the first one is consumed.
+    """
+
+    pending: Deque[Future] = deque()
+    for item in items:
+        pending.append(pool.submit(fn, *item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _iter_plugins(root: str) -> Iterator[Tuple[str, bool, Tuple[str, ...]]]:
+    """Yield ``(plugin_path, is_dir, sidecar_paths)`` below ``root`` using a single ``os.scandir`` pass per directory.
+
+    Extensions are checked on the entry name before any ``stat`` call, and
+    plugin bundles (directories such as ``Foo.vst3``) are yielded without
+    descending into their ``Contents`` tree; hidden and ``__MACOSX``
+    folders are pruned before they are listed. Sidecar JSON files are picked up
+    from the same listing, in ``_SIDECAR_SUFFIXES`` order, so the inspection
+    step never has to probe for files that are not there. ``is_dir`` comes
+    from the cached ``DirEntry`` type, so bundles are told apart from
+    binaries without another ``stat``.
+    """
+
+    stack = [root]
+    while stack:
+        top = stack.pop()
+        plugins: List[Tuple[str, str, bool]] = []
+        json_names: Set[str] = set()
+        try:
+            with os.scandir(top) as it:
+                for entry in it:
+                    name = entry.name
+                    # One ``lower()`` + C-level ``endswith`` beats packed-int or
+                    # case-variant set lookups on the tail in CPython.
+                    if name.lower().endswith(_SUPPORTED_SUFFIXES):
+                        plugins.append((name, entry.path, entry.is_dir()))
+                    elif entry.is_dir(follow_symlinks=False):
+                        if not name.startswith(".") and name.lower() not in _SKIPPED_DIRS:
+                            stack.append(entry.path)
+                    elif name.endswith(".json"):
+                        json_names.add(name)
+        except OSError:
+            # Unreadable directories are skipped, as ``Path.rglob`` did.
+            continue
+        # Yield only once the directory is fully listed so every sidecar is known.
+        for name, path, is_dir in plugins:
+            yield path, is_dir, tuple(
+                os.path.join(top, name + suffix) for suffix in _SIDECAR_SUFFIXES if name + suffix in json_names
+            )
+
+
+def _read_bytes(path: Union[str, Path]) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as fh:
+            return fh.read()
+    except OSError:
+        return None
+
+
+def _inspect_plugin(
+    path: Path, sidecars: Optional[Tuple[str, ...]] = None, is_dir: Optional[bool] = None
+) -> Optional[PluginRecord]:
     suffix = path.suffix.lower()
     plugin_type = "VST3" if suffix == ".vst3" else "VST2"
 
-    if suffix == ".vst3" and path.is_dir():
+    if suffix == ".vst3" and (path.is_dir() if is_dir is None else is_dir):
         metadata = _read_vst3_metadata(path)
     else:
-        metadata = _read_sidecar_metadata(path)
+        metadata = _read_sidecar_metadata(path, sidecars)
 
     name = metadata.get("name") or path.stem
     manufacturer = metadata.get("manufacturer") or path.parent.name
@@ -56,17 +166,16 @@ def _inspect_plugin(path: Path) -> Optional[PluginRecord]:
         path=path,
         identifier=identifier,
         version=version,
-        extra=metadata,
+        extra=metadata or None,
     )
 
 
 def _read_vst3_metadata(path: Path) -> dict:
     metadata: dict = {}
-    info_plist = path / "Contents" / "Info.plist"
-    if info_plist.exists():
+    data = _read_bytes(path / "Contents" / "Info.plist")
+    if data is not None:
         try:
-            with info_plist.open("rb") as fh:
-                plist_data = plistlib.load(fh)
+            plist_data = _scan_plist_keys(data) or _load_plist(data)
             metadata.update({
                 "name": plist_data.get("CFBundleName") or plist_data.get("CFBundleDisplayName"),
                 "identifier": plist_data.get("CFBundleIdentifier"),
@@ -79,16 +188,56 @@ def _read_vst3_metadata(path: Path) -> dict:
     return metadata
 
 
-def _read_sidecar_metadata(path: Path) -> dict:
-    """Try to read JSON metadata placed next to the plugin binary."""
+def _scan_plist_keys(data: bytes) -> Optional[dict]:
+    """Pull the handful of string keys we read straight out of an XML plist.
+
+    Returns ``None`` when fewer than two keys are found (binary or unusual
+    plists) or the text is not UTF-8, so the caller falls back to a full
+    ``plistlib`` parse.
+    """
+
+    declared = _XML_ENCODING_RE.match(data)
+    if declared and declared.group(1).lower() not in _UTF8_ENCODINGS:
+        return None
+    found: dict = {}
+    for key, value in _PLIST_KEYS_RE.findall(data):
+        key = key.decode("ascii")
+        if key not in found:
+            try:
+                text = value.decode("utf-8")
+            except UnicodeDecodeError:
+                return None
+            found[key] = unescape(text) if "&" in text else text
+    return found if len(found) >= 2 else None
+
+
+def _load_plist(data: bytes) -> dict:
+    """Parse Info.plist bytes without sniffing the format or decoding embedded blobs."""
+
+    if data.startswith(_BINARY_PLIST_MAGIC):
+        return plistlib.loads(data, fmt=plistlib.FMT_BINARY)
+    if len(data) > _LARGE_PLIST_BYTES:
+        # Large XML plists are large because of base64 <data> payloads (icons,
+        # thumbnails); none of the keys we read are data, so skip decoding them.
+        data = _PLIST_DATA_RE.sub(b"<data></data>", data)
+    return plistlib.loads(data, fmt=plistlib.FMT_XML)
+
+
+def _read_sidecar_metadata(path: Path, sidecars: Optional[Tuple[str, ...]] = None) -> dict:
+    """Try to read JSON metadata placed next to the plugin binary.
+
+    ``sidecars`` lists the sidecar files already seen by the directory walk;
+    when it is ``None`` every known sidecar location is tried.
+    """
 
+    if sidecars is None:
+        sidecars = tuple(f"{path}{suffix}" for suffix in _SIDECAR_SUFFIXES)
     metadata: dict = {}
-    for suffix in (".metadata.json", ".json"):
-        candidate = path.with_suffix(path.suffix + suffix)
-        if candidate.exists():
+    for sidecar in sidecars:
+        data = _read_bytes(sidecar)
+        if data is not None:
             try:
-                with candidate.open("r", encoding="utf-8") as fh:
-                    metadata = json.load(fh)
+                metadata = _json_loads(data)
                 break
             except Exception:
                 continue
@@ -6,16 +6,25 @@ VST Plugin Scanner v7.1 - Ultimate Edition (Safer Manufacturer Detection)
 """
 
 import json
+import mmap
 import os
 import sys
 import csv
 import argparse
+import bisect
+import functools
+import itertools
 import struct
-import winreg
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import List, Tuple, Optional, Dict, Iterable, Set
+from types import MappingProxyType
+from typing import (List, Tuple, Optional, Dict, Iterable, Iterator, Mapping,
+                    Set, Union)
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass, field, asdict
 
@@ -24,7 +33,22 @@ try:
     PEFILE_AVAILABLE = True
 except ImportError:
     PEFILE_AVAILABLE = False
-    print("⚠️ Библиотека pefile не установлена. Установите: pip install pefile\n")
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+try:
+    import winreg
+except ImportError:  # не Windows: реестра нет, остаются стандартные пути
+    winreg = None
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 # ==============================================================================
 # РАСШИРЕННАЯ БАЗА ДАННЫХ ПРОИЗВОДИТЕЛЕЙ
@@ -177,16 +201,16 @@ PLUGIN_NAME_TO_MANUFACTURER: Dict[str, str] = {
     # LiquidSonics
     'seventh heaven': 'LiquidSonics', 'reverberate': 'LiquidSonics',
     'cinematic rooms': 'LiquidSonics', 'tai chi': 'LiquidSonics',
-    'lustrous plates': 'LiquidSonics', 'illusion': 'LiquidSonics',
+    'illusion': 'LiquidSonics',
 
     # Acustica Audio
     'acqua': 'Acustica Audio', 'cream': 'Acustica Audio', 'sand': 'Acustica Audio',
-    'navy': 'Acustica Audio', 'fire': 'Acustica Audio', 'gold': 'Acustica Audio',
+    'navy': 'Acustica Audio', 'fire': 'Acustica Audio',
     'coral': 'Acustica Audio', 'jade': 'Acustica Audio', 'taupe': 'Acustica Audio',
     'tan': 'Acustica Audio', 'purple': 'Acustica Audio', 'magenta': 'Acustica Audio',
     'crimson': 'Acustica Audio', 'nebula': 'Acustica Audio', 'titanium': 'Acustica Audio',
     'amethyst': 'Acustica Audio', 'amber': 'Acustica Audio', 'rose': 'Acustica Audio',
-    'coffee': 'Acustica Audio', 'diamond': 'Acustica Audio', 'ultramarine': 'Acustica Audio',
+    'coffee': 'Acustica Audio', 'ultramarine': 'Acustica Audio',
     'lava': 'Acustica Audio',
 
     # IK Multimedia
@@ -370,7 +394,7 @@ PLUGIN_NAME_TO_MANUFACTURER: Dict[str, str] = {
 
     # Rob Papen
     'blade': 'Rob Papen', 'blue': 'Rob Papen', 'predator': 'Rob Papen',
-    'punch': 'Rob Papen', 'raw': 'Rob Papen', 'subboombass': 'Rob Papen',
+    'raw': 'Rob Papen', 'subboombass': 'Rob Papen',
     'vecto': 'Rob Papen', 'go2': 'Rob Papen', 'rp-verb': 'Rob Papen',
     'rp-delay': 'Rob Papen', 'rp-distort': 'Rob Papen',
 
@@ -435,8 +459,8 @@ PLUGIN_NAME_TO_MANUFACTURER: Dict[str, str] = {
     'substance': 'Output', 'analog strings': 'Output', 'analog brass': 'Output',
 
     # Infected Mushroom
-    'i wish': 'Infected Mushroom', 'gatekeeper': 'Infected Mushroom',
-    'pusher': 'Infected Mushroom', 'wider': 'Infected Mushroom',
+    'i wish': 'Infected Mushroom',
+    'pusher': 'Infected Mushroom',
     'bomber': 'Infected Mushroom',
 
     # D16 Group
@@ -493,7 +517,7 @@ PLUGIN_NAME_TO_MANUFACTURER: Dict[str, str] = {
     'soundid': 'Sonarworks', 'reference': 'Sonarworks',
 
     # Metric Halo
-    'channelstrip': 'Metric Halo', 'haloverb': 'Metric Halo',
+    'haloverb': 'Metric Halo',
     'multiband dynamics': 'Metric Halo', 'transientcontrol': 'Metric Halo',
 
     # Flux
@@ -532,6 +556,19 @@ PLUGIN_NAME_TO_MANUFACTURER: Dict[str, str] = {
     'prime:vocal': 'Sonible', 'prime vocal': 'Sonible',
 }
 
+# Имена, которые есть у нескольких производителей. Ключ остаётся в словаре
+# выше (в первой позиции), а здесь перечислены все кандидаты: при совпадении
+# выбирается тот, на кого указывает папка плагина, иначе — первый.
+AMBIGUOUS_PLUGIN_NAMES: Dict[str, Tuple[str, ...]] = {
+    'punch': ('Rob Papen', 'Antares'),
+    'diamond': ('Acustica Audio', 'Waves'),
+    'gold': ('Acustica Audio', 'Waves'),
+    'lustrous plates': ('LiquidSonics', 'Slate Digital'),
+    'gatekeeper': ('Infected Mushroom', 'Polyverse'),
+    'wider': ('Infected Mushroom', 'Polyverse'),
+    'channelstrip': ('Metric Halo', 'SSL'),
+}
+
 # Паттерны для определения производителя по тексту (CompanyName, Copyright и т.п.)
 MANUFACTURER_PATTERNS: Dict[str, str] = {
     r'\bantares\b': 'Antares',
@@ -651,6 +688,33 @@ FOLDER_TO_MANUFACTURER: Dict[str, str] = {
     'sonible': 'Sonible',
 }
 
+
+def _freeze(mapping: Dict[str, str]) -> Mapping[str, str]:
+    """
+    Интернирует ключи и значения (одинаковые производители становятся
+    одним объектом str) и возвращает read-only представление.
+    """
+    return MappingProxyType({sys.intern(k): sys.intern(v)
+                             for k, v in mapping.items()})
+
+
+# Базы неизменяемы: общие для всех потоков синглтоны, копировать не нужно.
+PLUGIN_NAME_TO_MANUFACTURER = _freeze(PLUGIN_NAME_TO_MANUFACTURER)
+MANUFACTURER_PATTERNS = _freeze(MANUFACTURER_PATTERNS)
+FOLDER_TO_MANUFACTURER = _freeze(FOLDER_TO_MANUFACTURER)
+
+
+def _invert(name_map: Mapping[str, str]) -> Mapping[str, Tuple[str, ...]]:
+    """Производитель -> его ключи; неоднозначные имена есть у всех кандидатов."""
+    inverted: Dict[str, List[str]] = {}
+    for key, mfr in name_map.items():
+        for vendor in AMBIGUOUS_PLUGIN_NAMES.get(key, (mfr,)):
+            inverted.setdefault(vendor, []).append(key)
+    return MappingProxyType({v: tuple(keys) for v, keys in inverted.items()})
+
+
+VENDOR_TO_KEYS = _invert(PLUGIN_NAME_TO_MANUFACTURER)
+
 VST2_PATHS: List[Path] = [
     Path(r"C:\Program Files\Common Files\Steinberg\VST2"),
     Path(r"C:\Program Files (x86)\VstPlugins"),
@@ -680,122 +744,455 @@ SHORT_NAME_WHITELIST: Set[str] = {
     'l1', 'l2', 'l3', 'dc8c', 'dc1a', 'mjuc', 'ott'
 }
 
+# Неоднозначные короткие коды и слишком общие слова: совпадают только
+# целым словом, иначе 'rx' находится в «brainworx», 'reverb' — в «MReverb»,
+# 'l1' — в «L12X». Границей слова считается и переход буква/цифра или
+# CamelCase: «RX10», «L1Ultra», «MasterRig». Характерные коды (dc1a, mjuc,
+# vmr, ott, ...) ищутся как подстрока: «DC1A3», «MJUCjr».
+# В имени целиком заглавными регистр о словах ничего не говорит, поэтому
+# там границы — только разделители и переход буква/цифра: «PUNCH BX1»
+# совпадает, «PUNCHBX1» и «MASTERRIG» — нет (иначе вернулся бы 'rx' в
+# «BRAINWORX»).
+WORD_BOUNDARY_KEYS: Set[str] = {
+    'rx', 'nx', 'l1', 'l2', 'l3', 'b2', 'b3',
+    'solid', 'master', 'reverb', 'micro', 'warm', 'fire', 'gold', 'boom',
+    'limit', 'modular', 'doubler', 'symphony', 'punch', 'equalize',
+}
+
+
+class KeywordMatcher:
+    """
+    Автомат Ахо-Корасик: за один проход по строке находит все ключи сразу.
+    best_rank возвращает ранг (меньше — приоритетнее) лучшего найденного
+    ключа, matches — все вхождения с позициями.
+    Использует pyahocorasick, если установлен, иначе — чистый Python.
+    """
+    def __init__(self, keywords: Iterable[Tuple[str, int]]):
+        ranks: Dict[str, int] = {}
+        for word, rank in keywords:
+            if word and rank < ranks.get(word, rank + 1):
+                ranks[word] = rank
+
+        if AHOCORASICK_AVAILABLE:
+            self._automaton = ahocorasick.Automaton()
+            for word, rank in ranks.items():
+                self._automaton.add_word(word, (rank, len(word)))
+            if ranks:
+                self._automaton.make_automaton()
+            return
+        self._automaton = None
+
+        # trie: переходы, ссылки неудач, ключи (ранг, длина) и лучший ранг
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[Tuple[int, int]]] = [[]]
+        for word, rank in ranks.items():
+            node = 0
+            for ch in word:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                node = nxt
+            out[node].append((rank, len(word)))
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                # узел наследует ключи, оканчивающиеся в его суффиксе
+                out[child].extend(out[fail[child]])
+                queue.append(child)
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+        self._best = [min(o)[0] if o else None for o in out]
+
+    def best_rank(self, text: str) -> Optional[int]:
+        if self._automaton is not None:
+            if not len(self._automaton):
+                return None
+            return min((value[0] for _, value in self._automaton.iter(text)),
+                       default=None)
+
+        goto, fail, best = self._goto, self._fail, self._best
+        result: Optional[int] = None
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            rank = best[state]
+            if rank is not None and (result is None or rank < result):
+                result = rank
+        return result
+
+    def matches(self, text: str) -> Iterable[Tuple[int, int, int]]:
+        """Все вхождения ключей: (начало, конец, ранг)."""
+        if self._automaton is not None:
+            if len(self._automaton):
+                for end, (rank, length) in self._automaton.iter(text):
+                    yield end + 1 - length, end + 1, rank
+            return
+
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for rank, length in out[state]:
+                yield i + 1 - length, i + 1, rank
+
+
+_DASH_SPACE_RE = re.compile(r'[\-\s]+')
+_KEY_SEPARATORS_RE = re.compile(r'[\s\-\_:]+')
+_CORP_SUFFIX_RE = re.compile(r'\s+(Inc\.?|LLC\.?|Ltd\.?|GmbH|Corp\.?|Co\.?)$',
+                             re.IGNORECASE)
+_COPYRIGHT_PREFIX_RE = re.compile(r'^(Copyright|©|\(c\))\s*\d*\s*', re.IGNORECASE)
+
+_WORD_BYTES = frozenset(b'abcdefghijklmnopqrstuvwxyz'
+                        b'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_')
+
+
+def _is_word_start(data: bytes, pos: int) -> bool:
+    return data[pos] in _WORD_BYTES and data[pos - 1] not in _WORD_BYTES
+
+
+def _is_word_boundary(text: str, pos: int) -> bool:
+    """Граница между text[pos - 1] и text[pos] (text — в исходном регистре)."""
+    if pos == 0 or pos == len(text):
+        return True
+    before, after = text[pos - 1], text[pos]
+    if not before.isalnum() or not after.isalnum():
+        return True
+    return (before.isdigit() != after.isdigit()
+            or (before.islower() and after.isupper()))
+
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    return _is_word_boundary(text, start) and _is_word_boundary(text, end)
+
+
+_NameIndex = Tuple[Tuple[KeywordMatcher, KeywordMatcher],
+                   Tuple[KeywordMatcher, KeywordMatcher], List[str]]
+
+
+def _build_name_matchers(name_map: Mapping[str, str]) -> _NameIndex:
+    """
+    Готовит ключи match_name один раз: сырые ключи ищутся в name.lower(),
+    очищенные — в имени без пробелов/дефисов. Ранг = позиция ключа в словаре,
+    поэтому побеждает тот же ключ, что и при последовательном переборе.
+    Ключи из WORD_BOUNDARY_KEYS идут в отдельную пару автоматов: их
+    вхождения засчитываются, только если это целое слово.
+    Возвращает пары (сырой, очищенный) автоматов и список ключей по рангу.
+    """
+    free: Tuple[List[Tuple[str, int]], List[Tuple[str, int]]] = ([], [])
+    bounded: Tuple[List[Tuple[str, int]], List[Tuple[str, int]]] = ([], [])
+    keys: List[str] = []
+    for key in name_map:
+        kl = key.lower()
+        # пропускаем слишком короткие ключи, кроме whitelist
+        plain = _KEY_SEPARATORS_RE.sub('', kl)
+        if len(plain) < 4 and kl not in SHORT_NAME_WHITELIST:
+            continue
+        rank = len(keys)
+        keys.append(key)
+        raw, clean = bounded if kl in WORD_BOUNDARY_KEYS else free
+        raw.append((kl, rank))
+        kc = _DASH_SPACE_RE.sub(' ', kl).strip()
+        if kc:
+            clean.append((kc, rank))
+    return ((KeywordMatcher(free[0]), KeywordMatcher(free[1])),
+            (KeywordMatcher(bounded[0]), KeywordMatcher(bounded[1])), keys)
+
+
+@functools.cache
+def _name_index() -> _NameIndex:
+    """Автоматы для match_name строятся при первом поиске, а не при импорте."""
+    return _build_name_matchers(PLUGIN_NAME_TO_MANUFACTURER)
+
+
+@functools.lru_cache(maxsize=8192)
+def _match_name_key(name: str, name_lower: str) -> Optional[str]:
+    """
+    Ключ PLUGIN_NAME_TO_MANUFACTURER, совпавший с именем (или None).
+    Кэшируется: одно и то же имя встречается в VST2/VST3/x86/x64 копиях.
+    Исходный регистр name нужен только для границ CamelCase.
+    """
+    # 1) сырое имя (важно для bx_, tal- и т.п.)
+    # 2) очищенное (важно для virtual mix rack, smart eq и т.п.);
+    #    подчёркивания не трогаем (для bx_ и tal-)
+    texts = (name_lower, _DASH_SPACE_RE.sub(' ', name_lower).strip())
+    free, bounded, keys = _name_index()
+
+    best: Optional[int] = None
+    for text, matcher in zip(texts, free):
+        rank = matcher.best_rank(text)
+        if rank is not None and (best is None or rank < best):
+            best = rank
+    originals = (name, _DASH_SPACE_RE.sub(' ', name).strip())
+    for text, original, matcher in zip(texts, originals, bounded):
+        # lower() изредка меняет длину (İ) — тогда границы ищем без регистра
+        if len(original) != len(text):
+            original = text
+        for start, end, rank in matcher.matches(text):
+            if ((best is None or rank < best)
+                    and _is_whole_word(original, start, end)):
+                best = rank
+    return None if best is None else keys[best]
+
+
+_WORD_SPLIT_RE = re.compile(r'(\W+)')
+_KEYWORD_WORD_RE = re.compile(r'[a-z0-9]+')
+_KEYWORD_SEP_RE = re.compile(r'(\[-\\s\]\?|\[-\]\?)')
+
+
+def _parse_keyword_pattern(pattern: str) -> Optional[Tuple[List[str], List[bool]]]:
+    r"""
+    Разбирает паттерн вида \bслово([-\s]?слово)*\b на слова и разделители
+    (True — кроме дефиса допустим пробел). Для настоящих regex — None.
+    """
+    if not (pattern.startswith(r'\b') and pattern.endswith(r'\b')):
+        return None
+    parts = _KEYWORD_SEP_RE.split(pattern[2:-2])
+    words = parts[0::2]
+    if not all(_KEYWORD_WORD_RE.fullmatch(w) for w in words):
+        return None
+    return words, [sep == r'[-\s]?' for sep in parts[1::2]]
+
+
+class PatternMatcher:
+    """
+    MANUFACTURER_PATTERNS без прогона ~85 regex на каждую строку.
+    Паттерны-«слова» (\\bwaves\\b, \\bplugin[-\\s]?alliance\\b) становятся
+    словарём токенов: текст один раз режется на слова, и 1-3 соседних слова
+    ищутся в словаре. Остальные (psp[a-z]*, tal[-\\s]) проверяются regex.
+    Побеждает паттерн, стоящий раньше в словаре, как и при переборе.
+    """
+    def __init__(self, patterns: Mapping[str, str]):
+        self._vendors = list(patterns.values())
+        # токены -> [(ранг, можно ли пробел в каждом разделителе)]
+        self._words: Dict[Tuple[str, ...], List[Tuple[int, Tuple[bool, ...]]]] = {}
+        self._residual: List[Tuple[int, "re.Pattern[str]"]] = []
+        self._max_words = 1
+        for rank, pattern in enumerate(patterns):
+            parsed = _parse_keyword_pattern(pattern)
+            if parsed is None:
+                self._residual.append((rank, re.compile(pattern, re.IGNORECASE)))
+                continue
+            words, spaces = parsed
+            # разделитель необязателен: «plugin alliance» и «pluginalliance»
+            for present in itertools.product((False, True), repeat=len(spaces)):
+                tokens = [words[0]]
+                seps: List[bool] = []
+                for word, is_present, space in zip(words[1:], present, spaces):
+                    if is_present:
+                        tokens.append(word)
+                        seps.append(space)
+                    else:
+                        tokens[-1] += word
+                self._words.setdefault(tuple(tokens), []).append((rank, tuple(seps)))
+                self._max_words = max(self._max_words, len(tokens))
+
+    def match(self, text: str) -> Optional[str]:
+        parts = _WORD_SPLIT_RE.split(text.lower())
+        tokens = parts[0::2]
+        gaps = parts[1::2]
+        words = self._words
+        best: Optional[int] = None
+
+        for i, token in enumerate(tokens):
+            if not token:
+                continue
+            for n in range(1, min(self._max_words, len(tokens) - i) + 1):
+                if n > 1:
+                    gap = gaps[i + n - 2]
+                    # [-\s]? допускает ровно один символ между словами
+                    if len(gap) != 1 or not (gap == '-' or gap.isspace()):
+                        break
+                hits = words.get(tuple(tokens[i:i + n]))
+                if not hits:
+                    continue
+                for rank, spaces in hits:
+                    if best is not None and rank >= best:
+                        continue
+                    if all(space or gaps[i + j] == '-'
+                           for j, space in enumerate(spaces)):
+                        best = rank
+
+        for rank, pattern in self._residual:
+            if best is not None and rank >= best:
+                break
+            if pattern.search(text):
+                best = rank
+                break
+
+        return None if best is None else self._vendors[best]
+
+
+# Последний резерв search_binary: точное (с учётом регистра) вхождение
+POPULAR_BINARY_BRANDS: Tuple[Tuple[bytes, str], ...] = (
+    (b'iZotope', 'iZotope'), (b'Antares', 'Antares'),
+    (b'FabFilter', 'FabFilter'), (b'Waves', 'Waves'),
+    (b'Valhalla', 'Valhalla DSP'), (b'Soundtoys', 'Soundtoys'),
+    (b'Plugin Alliance', 'Plugin Alliance'),
+    (b'Brainworx', 'Plugin Alliance'),
+    (b'Slate Digital', 'Slate Digital'),
+    (b'Universal Audio', 'Universal Audio'),
+    (b'Arturia', 'Arturia'),
+    (b'Native Instruments', 'Native Instruments'),
+    (b'Softube', 'Softube'),
+    (b'LiquidSonics', 'LiquidSonics'),
+    (b'Eventide', 'Eventide'),
+    (b'Celemony', 'Celemony'),
+    (b'Oeksound', 'Oeksound'),
+    (b'Goodhertz', 'Goodhertz'),
+    (b'Baby Audio', 'Baby Audio'),
+    (b'Kilohearts', 'Kilohearts'),
+    (b'Xfer Records', 'Xfer Records'),
+    (b'u-he', 'u-he'),
+    (b'Cableguys', 'Cableguys'),
+    (b'DMGAudio', 'DMGAudio'),
+    (b'PSPaudioware', 'PSPaudioware'),
+    (b'Acustica Audio', 'Acustica Audio'),
+    (b'sonible', 'Sonible'),
+)
+
+
+def _first_binary_match(data: bytes, fused: "re.Pattern[bytes]",
+                        patterns: List["re.Pattern[bytes]"],
+                        bounded: bool) -> Optional[int]:
+    """
+    Индекс первого (по порядку списка) паттерна, встречающегося в data.
+    Общая альтернация fused находит кандидатов за один проход; в каждом
+    найденном фрагменте проверяются только паттерны с меньшим индексом,
+    в том числе начинающиеся внутри фрагмента (bounded — все паттерны
+    начинаются с \\b, и можно смотреть только на начала слов).
+    """
+    best = len(patterns)
+    for m in fused.finditer(data):
+        start, end = m.span()
+        for pos in range(start, max(end, start + 1)):
+            if pos > start and bounded and not _is_word_start(data, pos):
+                continue
+            for i in range(best):
+                if patterns[i].match(data, pos):
+                    best = i
+                    break
+        if best == 0:
+            break
+    return best if best < len(patterns) else None
+
 
 class VSTDatabase:
     """Encapsulates manufacturer data and matching logic."""
     def __init__(self):
         self.name_map = PLUGIN_NAME_TO_MANUFACTURER
         self.folder_map = FOLDER_TO_MANUFACTURER
-        self.patterns = [
-            (re.compile(p, re.IGNORECASE), m)
+        self.pattern_matcher = PatternMatcher(MANUFACTURER_PATTERNS)
+        self.binary_patterns = [
+            (re.compile(p.encode('ascii', errors='ignore'), re.IGNORECASE), m)
             for p, m in MANUFACTURER_PATTERNS.items()
         ]
-
-    def match_name(self, name: str) -> Optional[str]:
+        # Все паттерны одной альтернацией: один проход по бинарнику
+        # вместо прохода на каждый паттерн (см. search_binary).
+        self._binary_regexes = [p for p, _ in self.binary_patterns]
+        self._binary_any = re.compile(
+            b'|'.join(b'(?:' + p.pattern + b')' for p in self._binary_regexes)
+            or b'(?!)', re.IGNORECASE)
+        self._binary_bounded = all(p.startswith(r'\b')
+                                   for p in MANUFACTURER_PATTERNS)
+        self._popular_patterns = [re.compile(re.escape(literal))
+                                  for literal, _ in POPULAR_BINARY_BRANDS]
+        self._popular_any = re.compile(
+            b'|'.join(re.escape(literal) for literal, _ in POPULAR_BINARY_BRANDS))
+        # ранг = позиция в словаре: побеждает первый ключ, найденный в пути
+        self._folder_matcher = KeywordMatcher(
+            (key, rank) for rank, key in enumerate(self.folder_map))
+        self._folder_vendors = list(self.folder_map.values())
+        self._wrap_caches()
+
+    def _wrap_caches(self) -> None:
+        # одни и те же CompanyName/LegalCopyright встречаются в сотнях DLL;
+        # таблицы неизменяемы, поэтому результаты можно кэшировать
+        self.match_pattern = functools.lru_cache(maxsize=4096)(self.match_pattern)
+        self.clean_manufacturer = functools.lru_cache(maxsize=4096)(self.clean_manufacturer)
+
+    # База уходит в процессы-обработчики (см. _init_worker): lru-обёртки и
+    # mappingproxy не сериализуются, поэтому передаём без них и восстанавливаем.
+    def __getstate__(self) -> Dict[str, object]:
+        state = dict(self.__dict__)
+        del state['match_pattern'], state['clean_manufacturer']
+        for key, value in state.items():
+            if isinstance(value, MappingProxyType):
+                state[key] = dict(value)
+        return state
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self.name_map = MappingProxyType(self.name_map)
+        self.folder_map = MappingProxyType(self.folder_map)
+        self._wrap_caches()
+
+    def match_name(self, name: str, name_lower: Optional[str] = None,
+                   path: Optional[Path] = None) -> Optional[str]:
         """
         Поиск производителя по имени плагина.
         Приоритет: сырое имя (для bx_ и т.п.), затем очищенное от пробелов/дефисов.
         Слишком короткие/общие ключи игнорируются, кроме whitelist.
+        name_lower можно передать, если вызывающий уже привёл имя к нижнему
+        регистру; path помогает выбрать производителя для неоднозначных имён.
         """
-        name_lower = name.lower()
-        # подчёркивания не трогаем (для bx_ и tal-)
-        name_clean = re.sub(r'[\-\s]+', ' ', name_lower).strip()
-
-        for key, mfr in self.name_map.items():
-            kl = key.lower()
-            # пропускаем слишком короткие ключи, кроме whitelist
-            plain = re.sub(r'[\s\-\_:]+', '', kl)
-            if len(plain) < 4 and kl not in SHORT_NAME_WHITELIST:
-                continue
-
-            kc = re.sub(r'[\-\s]+', ' ', kl).strip()
-
-            # 1) сырое имя (важно для bx_, tal- и т.п.)
-            if kl in name_lower:
-                return mfr
-
-            # 2) очищенное (важно для virtual mix rack, smart eq и т.п.)
-            if kc and kc in name_clean:
-                return mfr
+        if name_lower is None:
+            name_lower = name.lower()
+        key = _match_name_key(name, name_lower)
+        if key is None:
+            return None
 
-        return None
+        candidates = AMBIGUOUS_PLUGIN_NAMES.get(key)
+        if candidates:
+            folder = self.match_folder(path) if path is not None else None
+            return folder if folder in candidates else candidates[0]
+        return self.name_map[key]
 
     def match_pattern(self, text: str) -> Optional[str]:
-        for pattern, mfr in self.patterns:
-            if pattern.search(text):
-                return mfr
-        return None
+        return self.pattern_matcher.match(text)
 
     def match_folder(self, path: Path) -> Optional[str]:
-        path_parts = str(path).lower()
-        for key, mfr in self.folder_map.items():
-            if key in path_parts:
-                return mfr
-        for part in path.parts:
-            part_lower = part.lower()
-            if part_lower in self.folder_map:
-                return self.folder_map[part_lower]
-            for key, mfr in self.folder_map.items():
-                if key in part_lower:
-                    return mfr
-        return None
+        # Любой сегмент пути — подстрока полного пути, поэтому достаточно
+        # одного прохода автомата по str(path).
+        rank = self._folder_matcher.best_rank(str(path).lower())
+        return None if rank is None else self._folder_vendors[rank]
 
     def clean_manufacturer(self, name: str) -> str:
         if not name:
             return "Unknown"
         name = name.strip().rstrip(',').rstrip('.').strip()
-        name = re.sub(r'\s+(Inc\.?|LLC\.?|Ltd\.?|GmbH|Corp\.?|Co\.?)$', '',
-                      name, flags=re.IGNORECASE)
-        name = re.sub(r'^(Copyright|©|\(c\))\s*\d*\s*', '',
-                      name, flags=re.IGNORECASE)
+        name = _CORP_SUFFIX_RE.sub('', name)
+        name = _COPYRIGHT_PREFIX_RE.sub('', name)
         if not name or len(name) < 2:
             return "Unknown"
-        for pattern, normalized in self.patterns:
-            if pattern.search(name):
-                return normalized
-        return name
+        return self.match_pattern(name) or name
 
     def search_binary(self, data: bytes) -> Optional[str]:
         # сначала пробуем regex-паттерны производителей
-        for pattern, mfr in MANUFACTURER_PATTERNS.items():
-            try:
-                if re.search(pattern.encode('ascii', errors='ignore'),
-                            data, re.IGNORECASE):
-                    return mfr
-            except Exception:
-                pass
+        best = _first_binary_match(data, self._binary_any,
+                                   self._binary_regexes, self._binary_bounded)
+        if best is not None:
+            return self.binary_patterns[best][1]
 
         # затем несколько популярных брендов простым поиском
-        popular = [
-            (b'iZotope', 'iZotope'), (b'Antares', 'Antares'),
-            (b'FabFilter', 'FabFilter'), (b'Waves', 'Waves'),
-            (b'Valhalla', 'Valhalla DSP'), (b'Soundtoys', 'Soundtoys'),
-            (b'Plugin Alliance', 'Plugin Alliance'),
-            (b'Brainworx', 'Plugin Alliance'),
-            (b'Slate Digital', 'Slate Digital'),
-            (b'Universal Audio', 'Universal Audio'),
-            (b'Arturia', 'Arturia'),
-            (b'Native Instruments', 'Native Instruments'),
-            (b'Softube', 'Softube'),
-            (b'LiquidSonics', 'LiquidSonics'),
-            (b'Eventide', 'Eventide'),
-            (b'Celemony', 'Celemony'),
-            (b'Oeksound', 'Oeksound'),
-            (b'Goodhertz', 'Goodhertz'),
-            (b'Baby Audio', 'Baby Audio'),
-            (b'Kilohearts', 'Kilohearts'),
-            (b'Xfer Records', 'Xfer Records'),
-            (b'u-he', 'u-he'),
-            (b'Cableguys', 'Cableguys'),
-            (b'DMGAudio', 'DMGAudio'),
-            (b'PSPaudioware', 'PSPaudioware'),
-            (b'Acustica Audio', 'Acustica Audio'),
-            (b'sonible', 'Sonible'),
-        ]
-        for pattern, mfr in popular:
-            if pattern in data:
-                return mfr
-        return None
+        best = _first_binary_match(data, self._popular_any,
+                                   self._popular_patterns, bounded=False)
+        return None if best is None else POPULAR_BINARY_BRANDS[best][1]
 
 
 class ProgressBar:
@@ -823,6 +1220,133 @@ class ProgressBar:
         sys.stdout.write('\n')
 
 
+# ключи Info.plist, которые использует _determine_manufacturer
+_PLIST_KEYS = frozenset({'NSHumanReadableCopyright', 'CFBundleName'})
+
+# кандидат из обхода: (путь, "VST3"/"VST2", это папка)
+_Candidate = Tuple[Path, str, bool]
+
+# содержимое файла: mmap или bytes
+_Buffer = Union[bytes, mmap.mmap]
+
+_RT_VERSION = 16
+
+
+def _align4(pos: int) -> int:
+    return (pos + 3) & ~3
+
+
+def _rva_to_offset(sections: List[Tuple[int, int, int]], rva: int) -> int:
+    for va, size, raw in sections:
+        if va <= rva < va + size:
+            return rva - va + raw
+    raise ValueError(f"RVA {rva:#x} outside sections")
+
+
+def _version_info_node(blob: bytes, pos: int) -> Tuple[str, int, int, int]:
+    """Узел VERSIONINFO: (ключ, wValueLength, начало значения, конец узла)."""
+    length, value_len, _ = struct.unpack_from('<HHH', blob, pos)
+    if length < 6:
+        raise ValueError("bad VERSIONINFO node")
+    end = min(pos + length, len(blob))
+    key_end = pos + 6
+    while key_end + 1 < end and blob[key_end:key_end + 2] != b'\0\0':
+        key_end += 2
+    key = blob[pos + 6:key_end].decode('utf-16-le', errors='ignore')
+    return key, value_len, _align4(key_end + 2), end
+
+
+def _version_info_children(blob: bytes, pos: int,
+                           end: int) -> Iterator[Tuple[str, int, int, int]]:
+    while pos + 6 <= end:
+        node = _version_info_node(blob, pos)
+        yield node
+        pos = _align4(node[3])
+
+
+def _read_version_strings(data: _Buffer) -> Optional[Dict[str, str]]:
+    """
+    Строки StringFileInfo (CompanyName, ProductName, ...) из ресурса
+    VS_VERSION_INFO без построения всего дерева ресурсов, как это делает
+    pefile. {} — ресурса нет; None — структура не разобрана (пусть
+    попробует pefile).
+    """
+    try:
+        if data[:2] != b'MZ':
+            return None
+        pe = struct.unpack_from('<I', data, 0x3C)[0]
+        if data[pe:pe + 4] != b'PE\0\0':
+            return None
+        n_sections, = struct.unpack_from('<H', data, pe + 6)
+        opt_size, = struct.unpack_from('<H', data, pe + 20)
+        opt = pe + 24
+        magic, = struct.unpack_from('<H', data, opt)
+        dirs = opt + (96 if magic == 0x10b else 112)
+        n_dirs, = struct.unpack_from('<I', data, dirs - 4)
+        if n_dirs <= 2:
+            return {}
+        res_rva, res_size = struct.unpack_from('<II', data, dirs + 2 * 8)
+        if not res_rva or not res_size:
+            return {}
+
+        sections = []
+        table = opt + opt_size
+        for i in range(n_sections):
+            vsize, va, raw_size, raw = struct.unpack_from(
+                '<IIII', data, table + i * 40 + 8)
+            sections.append((va, max(vsize, raw_size), raw))
+        base = _rva_to_offset(sections, res_rva)
+
+        # тип RT_VERSION -> первое имя -> первый язык -> data entry
+        offset, wanted = 0, _RT_VERSION
+        for _ in range(3):
+            named, ids = struct.unpack_from('<HH', data, base + offset + 12)
+            entries = base + offset + 16
+            for i in range(named + ids):
+                name, target = struct.unpack_from('<II', data, entries + i * 8)
+                if wanted is None or (not name & 0x80000000 and name == wanted):
+                    break
+            else:
+                return {}
+            if not target & 0x80000000:
+                break
+            offset, wanted = target & 0x7FFFFFFF, None
+        if target & 0x80000000:
+            return None
+        blob_rva, blob_size = struct.unpack_from('<II', data, base + target)
+        start = _rva_to_offset(sections, blob_rva)
+        blob = bytes(data[start:start + blob_size])
+
+        key, value_len, value, end = _version_info_node(blob, 0)
+        if key != 'VS_VERSION_INFO':
+            return None
+        strings: Dict[str, str] = {}
+        for key, _, pos, node_end in _version_info_children(
+                blob, _align4(value + value_len), end):
+            if key != 'StringFileInfo':
+                continue
+            for _, _, table_pos, table_end in _version_info_children(
+                    blob, pos, node_end):
+                for name, value_len, pos, string_end in _version_info_children(
+                        blob, table_pos, table_end):
+                    text = (blob[pos:string_end].decode('utf-16-le', errors='ignore')
+                            if value_len else '')
+                    text = text.split('\0', 1)[0].strip()
+                    if text:
+                        strings[name] = text
+        return strings
+    except (struct.error, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class Vst3Layout:
+    """Что лежит внутри бандла .vst3: DLL по архитектурам и файлы метаданных."""
+    dlls: Tuple[Tuple[Path, str], ...] = ()
+    has_moduleinfo: bool = False
+    has_plist: bool = False
+
+
 @dataclass(frozen=True)
 class PluginInfo:
     manufacturer: str
@@ -846,15 +1370,45 @@ class VSTScanner:
     verbose: bool = False
     unknown_plugins: List[PluginInfo] = field(default_factory=list)
     db: VSTDatabase = field(default_factory=VSTDatabase)
+    cache_file: Optional[Path] = None
 
     def __post_init__(self) -> None:
-        self.vst3_paths = self._get_all_vst3_paths()
-        self.vst2_paths = self._get_all_vst2_paths()
+        # PE-метаданные по ключу "путь|размер|mtime_ns": обновлённый плагин
+        # получает новый ключ, поэтому кэш не устаревает
+        self._meta_cache: Dict[str, Dict[str, str]] = self._load_meta_cache()
+        self._meta_used: Dict[str, Dict[str, str]] = {}
+        self._meta_lock = threading.Lock()
+
+    def _load_meta_cache(self) -> Dict[str, Dict[str, str]]:
+        if self.cache_file is None:
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        # повреждённые записи отбрасываем, чтобы не отдать их вместо метаданных
+        return {k: v for k, v in data.items() if isinstance(v, dict)}
+
+    def _save_meta_cache(self) -> None:
+        """Сохраняет только записи этого запуска: удалённые плагины выпадают."""
+        if self.cache_file is None:
+            return
+        try:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self._meta_used, f, ensure_ascii=False)
+        except OSError as e:
+            if self.verbose:
+                print(f"  ⚠️ Cache write error: {e}")
 
     def _get_registry_paths(self, key_path: str,
                             value_name: str = "VSTPluginsPath") -> List[Path]:
         """Читает пути из реестра Windows."""
         paths: List[Path] = []
+        if winreg is None:
+            return paths
         for root in [winreg.HKEY_LOCAL_MACHINE, winreg.HKEY_CURRENT_USER]:
             try:
                 with winreg.OpenKey(root, key_path) as key:
@@ -867,6 +1421,15 @@ class VSTScanner:
                 pass
         return paths
 
+    # Пути ищутся при первом обращении: процессам-обработчикам они не нужны
+    @functools.cached_property
+    def vst3_paths(self) -> List[Path]:
+        return self._get_all_vst3_paths()
+
+    @functools.cached_property
+    def vst2_paths(self) -> List[Path]:
+        return self._get_all_vst2_paths()
+
     def _get_all_vst3_paths(self) -> List[Path]:
         """Собирает все возможные пути VST3."""
         paths: Set[Path] = set()
@@ -898,13 +1461,40 @@ class VSTScanner:
 
         return [p for p in paths if p.exists()]
 
-    def _extract_pe_metadata(self, file_path: Path) -> Dict[str, str]:
+    def _extract_pe_metadata(self, file_path: Path,
+                             data: Optional[_Buffer] = None) -> Dict[str, str]:
         """Метод: извлечение метаданных из PE файла."""
+        if self.cache_file is None:
+            # без кэша ключ не нужен — не тратим stat на каждый файл
+            return self._read_pe_metadata(file_path, data)
+        try:
+            st = file_path.stat()
+        except OSError:
+            return {}
+        cache_key = f"{file_path}|{st.st_size}|{st.st_mtime_ns}"
+        with self._meta_lock:
+            metadata = self._meta_cache.get(cache_key)
+        if metadata is None:
+            metadata = self._read_pe_metadata(file_path, data)
+        with self._meta_lock:
+            self._meta_cache[cache_key] = metadata
+            self._meta_used[cache_key] = metadata
+        return metadata
+
+    def _read_pe_metadata(self, file_path: Path,
+                          data: Optional[_Buffer] = None) -> Dict[str, str]:
+        if data is None:
+            with self._map_file(file_path) as mapped:
+                return self._read_pe_metadata(file_path, mapped)
+        strings = _read_version_strings(data)
+        if strings is not None:
+            return strings
+        # нестандартный файл — пусть разбирается pefile
         if not PEFILE_AVAILABLE:
             return {}
-
         try:
-            pe = pefile.PE(str(file_path), fast_load=True)
+            pe = (pefile.PE(data=data, fast_load=True) if data
+                  else pefile.PE(str(file_path), fast_load=True))
             pe.parse_data_directories(directories=[
                 pefile.DIRECTORY_ENTRY['IMAGE_DIRECTORY_ENTRY_RESOURCE']
             ])
@@ -934,50 +1524,66 @@ class VSTScanner:
     def _parse_vst3_moduleinfo(self, vst3_path: Path) -> Dict[str, str]:
         """Метод: парсинг moduleinfo.json для VST3."""
         moduleinfo = vst3_path / "Contents" / "Resources" / "moduleinfo.json"
-        if moduleinfo.exists():
+        try:
+            with open(moduleinfo, 'rb') as f:
+                raw = f.read()
             try:
-                with open(moduleinfo, 'r', encoding='utf-8',
-                          errors='ignore') as f:
-                    data = json.load(f)
-                return {
-                    'Vendor': data.get('Vendor', data.get('Manufacturer', '')),
-                    'Name': data.get('Name', '')
-                }
-            except Exception:
-                pass
-        return {}
+                data = _json_loads(raw)
+            except ValueError:  # битый UTF-8: как раньше, с errors='ignore'
+                data = json.loads(raw.decode('utf-8', errors='ignore'))
+            return {
+                'Vendor': data.get('Vendor', data.get('Manufacturer', '')),
+                'Name': data.get('Name', '')
+            }
+        except Exception:
+            return {}
 
     def _parse_vst3_plist(self, vst3_path: Path) -> Dict[str, str]:
         """Метод: парсинг Info.plist для VST3."""
         plist = vst3_path / "Contents" / "Info.plist"
-        if not plist.exists():
-            return {}
 
+        # потоковый разбор: дерево не строим и выходим, как только
+        # нашлись все нужные ключи верхнего <dict>
+        plist_dict: Dict[str, str] = {}
         try:
-            tree = ET.parse(plist)
-            root = tree.getroot()
-            dict_elem = root.find('dict')
-            if dict_elem is None:
-                return {}
-
-            plist_dict: Dict[str, str] = {}
-            key_elem = None
-            for elem in dict_elem:
-                if elem.tag == 'key':
-                    key_elem = elem.text or ""
-                elif elem.tag in ('string', 'real', 'integer') and key_elem:
-                    plist_dict[key_elem] = elem.text or ""
-                    key_elem = None
-
+            depth = 0
+            in_top_dict = False
+            key: Optional[str] = None
+            for event, elem in ET.iterparse(plist, events=('start', 'end')):
+                if event == 'start':
+                    depth += 1
+                    if depth == 2 and elem.tag == 'dict':
+                        in_top_dict = True
+                    continue
+                depth -= 1
+                if not in_top_dict:
+                    continue
+                if depth == 1:  # верхний <dict> закрыт
+                    break
+                if depth == 2:
+                    if elem.tag == 'key':
+                        key = elem.text or ""
+                    else:
+                        if (key in _PLIST_KEYS
+                                and elem.tag in ('string', 'real', 'integer')):
+                            plist_dict[key] = elem.text or ""
+                            if len(plist_dict) == len(_PLIST_KEYS):
+                                break
+                        key = None
+                    elem.clear()
             return plist_dict
         except Exception:
             return {}
 
-    def _determine_manufacturer(self, file_path: Path,
-                                plugin_type: str) -> Tuple[str, str]:
+    def _determine_manufacturer(self, file_path: Path, plugin_type: str,
+                                data: Optional[_Buffer] = None,
+                                layout: Optional[Vst3Layout] = None
+                                ) -> Tuple[str, str]:
         """
         Комплексное определение производителя с приоритетами.
         Возвращает (manufacturer, name).
+        data — уже отображённое содержимое file_path, если это файл;
+        layout — содержимое бандла, если file_path — папка VST3.
 
         Приоритеты (от более честных к менее честным):
         1) Имя плагина (ручной маппинг)
@@ -991,29 +1597,32 @@ class VSTScanner:
                         .replace('.vst3', '')
                         .replace('.dll', ''))
         name = default_name
+        default_lower = default_name.lower()
 
         # WaveShell — всегда Waves, но только для самого WaveShell
-        if 'waveshell' in default_name.lower():
+        if 'waveshell' in default_lower:
             return 'Waves', default_name
 
         # === 1: По имени плагина ===
-        manufacturer = self.db.match_name(default_name)
+        manufacturer = self.db.match_name(default_name, default_lower,
+                                          file_path)
         if manufacturer:
             return manufacturer, name
 
+        if (layout is None and plugin_type == "VST3"
+                and data is None and file_path.is_dir()):
+            layout = self._probe_vst3_layout(file_path)
+
         dll_candidates: List[Path] = []
-        if plugin_type == "VST3" and file_path.is_dir():
-            for arch_dir in ["x86_64-win", "x86-win"]:
-                dll_path = (file_path / "Contents" / arch_dir /
-                            (file_path.stem + ".vst3"))
-                if dll_path.exists():
-                    dll_candidates.append(dll_path)
+        if layout is not None:
+            dll_candidates.extend(dll for dll, _ in layout.dlls)
         elif file_path.is_file():
             dll_candidates.append(file_path)
 
         # === 2: Для VST3 — moduleinfo.json ===
-        if plugin_type == "VST3" and file_path.is_dir():
-            module_data = self._parse_vst3_moduleinfo(file_path)
+        if layout is not None:
+            module_data = (self._parse_vst3_moduleinfo(file_path)
+                           if layout.has_moduleinfo else {})
             if module_data.get('Vendor'):
                 vendor = self.db.clean_manufacturer(module_data['Vendor'])
                 if vendor != "Unknown":
@@ -1021,7 +1630,8 @@ class VSTScanner:
                     return vendor, name
 
             # === 3: Info.plist ===
-            plist_data = self._parse_vst3_plist(file_path)
+            plist_data = (self._parse_vst3_plist(file_path)
+                          if layout.has_plist else {})
             if plist_data:
                 copyright_str = plist_data.get(
                     'NSHumanReadableCopyright', '')
@@ -1034,7 +1644,8 @@ class VSTScanner:
 
         # === 4: PE Metadata ===
         for dll in dll_candidates:
-            metadata = self._extract_pe_metadata(dll)
+            metadata = self._extract_pe_metadata(
+                dll, data if dll == file_path else None)
             if not metadata:
                 continue
 
@@ -1066,8 +1677,9 @@ class VSTScanner:
 
         # === 6: Быстрый бинарный поиск ===
         if dll_candidates:
-            binary_mfr = self.db.search_binary(
-                self._read_binary_head(dll_candidates[0]))
+            dll = dll_candidates[0]
+            binary_mfr = self.db.search_binary(self._read_binary_head(
+                dll, data=data if dll == file_path else None))
             if binary_mfr:
                 return binary_mfr, name
 
@@ -1078,99 +1690,201 @@ class VSTScanner:
 
         return "Unknown", name
 
-    def _read_binary_head(self, file_path: Path,
-                          size: int = 256 * 1024) -> bytes:
+    def _read_binary_head(self, file_path: Path, size: int = 256 * 1024,
+                          data: Optional[_Buffer] = None) -> bytes:
+        if data:
+            return b"" if len(data) > 20 * 1024 * 1024 else data[:size]
         try:
-            if file_path.stat().st_size > 20 * 1024 * 1024:
-                return b""
+            # буферизованный read(n) дочитывает до n байт или EOF;
+            # сырой read() на сетевых дисках может вернуть меньше
             with open(file_path, 'rb') as f:
+                # размер по уже открытому дескриптору: без отдельного stat()
+                if os.fstat(f.fileno()).st_size > 20 * 1024 * 1024:
+                    return b""
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(f.fileno(), 0, size,
+                                     os.POSIX_FADV_SEQUENTIAL)
                 return f.read(size)
         except Exception:
             return b""
 
     @staticmethod
-    def _get_pe_architecture(file_path: Path) -> str:
-        """Определяет архитектуру PE файла."""
+    @contextmanager
+    def _map_file(file_path: Path) -> Iterator[_Buffer]:
+        """
+        Один mmap на файл: из него берутся архитектура, PE-ресурсы и голова
+        для бинарного поиска, вместо трёх отдельных open(). Пустой или
+        недоступный файл даёт b"".
+        """
+        mm = None
         try:
             with open(file_path, 'rb') as f:
-                if f.read(2) != b'MZ':
-                    return "Unknown"
-                f.seek(0x3C)
-                pe_offset = struct.unpack('<I', f.read(4))[0]
-                f.seek(pe_offset)
-                if f.read(4) != b'PE\0\0':
-                    return "Unknown"
-                machine = struct.unpack('<H', f.read(2))[0]
-                return ("x64" if machine == 0x8664
-                        else "x86" if machine == 0x014c
-                        else "Unknown")
-        except Exception:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            pass
+        try:
+            yield mm if mm is not None else b""
+        finally:
+            if mm is not None:
+                try:
+                    mm.close()
+                except BufferError:  # буфер ещё экспортирован — закроет GC
+                    pass
+
+    @staticmethod
+    def _get_pe_architecture(data: _Buffer) -> str:
+        """Определяет архитектуру PE файла по его содержимому."""
+        try:
+            if data[:2] != b'MZ':
+                return "Unknown"
+            pe_offset = struct.unpack_from('<I', data, 0x3C)[0]
+            if data[pe_offset:pe_offset + 4] != b'PE\0\0':
+                return "Unknown"
+            machine = struct.unpack_from('<H', data, pe_offset + 4)[0]
+            return ("x64" if machine == 0x8664
+                    else "x86" if machine == 0x014c
+                    else "Unknown")
+        except struct.error:
             return "Unknown"
 
-    def extract_vst3_info(self, file_path: Path) -> PluginInfo:
-        """Извлекает информацию о VST3 плагине."""
-        arch = "Unknown"
-        if file_path.is_dir():
-            for arch_dir, arch_name in [("x86_64-win", "x64"),
-                                        ("x86-win", "x86")]:
-                dll = file_path / "Contents" / arch_dir / (file_path.stem + ".vst3")
+    @staticmethod
+    def _probe_vst3_layout(bundle: Path) -> Vst3Layout:
+        """
+        Один scandir(Contents) вместо отдельных exists() на каждую
+        архитектуру, moduleinfo.json и Info.plist.
+        """
+        contents = bundle / "Contents"
+        try:
+            with os.scandir(contents) as it:
+                names = {entry.name.lower() for entry in it}
+        except OSError:
+            return Vst3Layout()
+        dlls = []
+        for arch_dir, arch_name in [("x86_64-win", "x64"), ("x86-win", "x86")]:
+            if arch_dir in names:
+                dll = contents / arch_dir / (bundle.stem + ".vst3")
                 if dll.exists():
-                    arch = arch_name
-                    break
-        else:
-            arch = self._get_pe_architecture(file_path)
+                    dlls.append((dll, arch_name))
+        has_moduleinfo = ("resources" in names and
+                          (contents / "Resources" / "moduleinfo.json").exists())
+        return Vst3Layout(tuple(dlls), has_moduleinfo, "info.plist" in names)
 
-        manufacturer, name = self._determine_manufacturer(file_path, "VST3")
+    def extract_vst3_info(self, file_path: Path,
+                          is_dir: Optional[bool] = None) -> PluginInfo:
+        """Извлекает информацию о VST3 плагине."""
+        if is_dir is None:
+            is_dir = file_path.is_dir()
+        if is_dir:
+            layout = self._probe_vst3_layout(file_path)
+            arch = layout.dlls[0][1] if layout.dlls else "Unknown"
+        else:
+            with self._map_file(file_path) as data:
+                arch = self._get_pe_architecture(data)
+                manufacturer, name = self._determine_manufacturer(
+                    file_path, "VST3", data)
+            return PluginInfo(manufacturer, name, "VST3", arch, str(file_path))
+
+        manufacturer, name = self._determine_manufacturer(
+            file_path, "VST3", layout=layout)
         return PluginInfo(manufacturer, name, "VST3", arch, str(file_path))
 
     def extract_vst2_info(self, file_path: Path) -> PluginInfo:
         """Извлекает информацию о VST2 плагине."""
-        arch = self._get_pe_architecture(file_path)
-        manufacturer, name = self._determine_manufacturer(file_path, "VST2")
+        with self._map_file(file_path) as data:
+            arch = self._get_pe_architecture(data)
+            manufacturer, name = self._determine_manufacturer(
+                file_path, "VST2", data)
         return PluginInfo(manufacturer, name, "VST2", arch, str(file_path))
 
-    def _discover_files(self) -> List[Tuple[Path, str]]:
+    @staticmethod
+    def _walk(root: Path, suffix: str) -> Iterator[Tuple[Path, bool]]:
+        """
+        Обход os.scandir вместо rglob: расширение проверяется по имени
+        записи, тип — по закэшированному DirEntry. Бандл (папка Foo.vst3)
+        возвращается целиком, внутрь него не заходим; недоступные папки
+        пропускаются, как и в rglob. Возвращает (путь, это папка).
+        """
+        stack = [str(root)]
+        while stack:
+            top = stack.pop()
+            try:
+                with os.scandir(top) as it:
+                    for entry in it:
+                        if entry.name.lower().endswith(suffix):
+                            yield Path(entry.path), entry.is_dir()
+                        elif entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+            except OSError:
+                continue
+
+    def _discover_files(self) -> List[_Candidate]:
         """Phase 1: Discover all candidate files."""
-        candidates: List[Tuple[Path, str]] = []
+        candidates: List[_Candidate] = []
 
         # VST3
         for path in self.vst3_paths:
-            try:
-                for item in path.rglob('*.vst3'):
-                    candidates.append((item, "VST3"))
-            except Exception:
-                pass
+            candidates.extend((item, "VST3", is_dir)
+                              for item, is_dir in self._walk(path, '.vst3'))
 
         # VST2
         for path in self.vst2_paths:
-            try:
-                for item in path.rglob('*.dll'):
-                    candidates.append((item, "VST2"))
-            except Exception:
-                pass
+            candidates.extend((item, "VST2", is_dir)
+                              for item, is_dir in self._walk(path, '.dll'))
 
         return candidates
 
-    def _process_file(self, item: Tuple[Path, str]) -> Optional[PluginInfo]:
-        """Process a single file."""
-        path, ptype = item
-        try:
-            resolved = path.resolve()
+    def _unique_files(self, files: List[_Candidate]) -> List[_Candidate]:
+        """Resolve candidates and drop ones already seen (symlinks, overlaps)."""
+        unique: List[_Candidate] = []
+        seen_raw: Set[str] = set()
+        for path, ptype, is_dir in files:
+            # пути из базовой папки и её подпапок совпадают дословно —
+            # такие отсекаем до resolve(), который стоит нескольких syscall
+            raw = os.fspath(path)
+            if raw in seen_raw:
+                continue
+            seen_raw.add(raw)
+            try:
+                resolved = path.resolve()
+            except Exception:
+                continue
             str_resolved = str(resolved)
 
             # простая защита от повторной обработки одного и того же файла
             if str_resolved in self.scanned_paths:
-                return None
+                continue
             self.scanned_paths.add(str_resolved)
+            unique.append((resolved, ptype, is_dir))
+        return unique
 
+    def _process_file(self, item: _Candidate) -> Optional[PluginInfo]:
+        """Process a single resolved file."""
+        path, ptype, is_dir = item
+        try:
             if ptype == "VST3":
-                return self.extract_vst3_info(resolved)
+                return self.extract_vst3_info(path, is_dir)
             else:
-                return self.extract_vst2_info(resolved)
+                return self.extract_vst2_info(path)
         except Exception:
             return None
 
-    def scan_all_plugins(self, max_workers: int = 8) -> None:
+    def _add_plugin(self, plugin: PluginInfo, seen: Set[Tuple[str, str, str]],
+                    sort_keys: List[Tuple[str, str]]) -> None:
+        """
+        Вставляет плагин в self.plugins, сохраняя порядок
+        (производитель, имя); повтор (имя, тип, путь) пропускается.
+        Равные ключи встают после уже вставленных, как при стабильной сортировке.
+        """
+        key = (plugin.name.lower(), plugin.plugin_type, plugin.path)
+        if key in seen:
+            return
+        seen.add(key)
+        sort_key = (plugin.manufacturer.lower(), plugin.name.lower())
+        i = bisect.bisect_right(sort_keys, sort_key)
+        sort_keys.insert(i, sort_key)
+        self.plugins.insert(i, plugin)
+
+    def scan_all_plugins(self, max_workers: Optional[int] = None) -> None:
         """Сканирует все плагины."""
         print("🔍 Начинаю сканирование плагинов...")
         print(f"📂 VST3 путей: {len(self.vst3_paths)}, "
@@ -1180,6 +1894,7 @@ class VSTScanner:
         print("⏳ Поиск файлов (Phase 1/2)...")
         files = self._discover_files()
         print(f"   Найдено кандидатов: {len(files)}")
+        files = self._unique_files(files)
 
         if not files:
             print("   Плагины не найдены.")
@@ -1189,35 +1904,54 @@ class VSTScanner:
         print(f"🚀 Обработка файлов (Phase 2/2)...")
         progress = ProgressBar(len(files))
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_file = {
-                executor.submit(self._process_file, f): f
-                for f in files
-            }
-
-            for future in as_completed(future_to_file):
-                try:
-                    result = future.result()
-                    if result:
-                        self.plugins.append(result)
-                except Exception as e:
-                    if self.verbose:
-                        print(f"  ⚠️ Task error: {e}")
-                finally:
+        # self.plugins держится отсортированным и без дубликатов по мере
+        # поступления результатов — без отдельного прохода dict + sorted
+        existing, self.plugins = self.plugins, []
+        seen: Set[Tuple[str, str, str]] = set()
+        sort_keys: List[Tuple[str, str]] = []
+        for p in existing:
+            self._add_plugin(p, seen, sort_keys)
+
+        # pefile, regex и разбор XML упираются в GIL — нужны процессы
+        remaining = dict.fromkeys(files)
+        errors = 0
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers,
+                                     initializer=_init_worker,
+                                     initargs=(self.db, self.verbose,
+                                               self.cache_file,
+                                               self._meta_cache)) as executor:
+                futures = {executor.submit(_process_in_worker, f): f
+                           for f in files}
+
+                for future in as_completed(futures):
+                    try:
+                        result, meta_used = future.result()
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        errors += 1
+                        if self.verbose:
+                            print(f"  ⚠️ Task error: {e}")
+                    else:
+                        self._meta_used.update(meta_used)
+                        if result:
+                            self._add_plugin(result, seen, sort_keys)
+                    del remaining[futures[future]]
                     progress.update()
+        except Exception as e:
+            # пул не поднялся или упал (инициализатор, передача базы,
+            # убитый процесс) — досчитываем оставшееся в этом процессе
+            print(f"\n  ⚠️ Пул процессов недоступен ({e!r}), "
+                  f"обрабатываю {len(remaining)} файлов без него")
+            for item in remaining:
+                result = self._process_file(item)
+                if result:
+                    self._add_plugin(result, seen, sort_keys)
+                progress.update()
 
         progress.finish()
-
-        # Удаляем дубликаты и сортируем
-        unique: Dict[Tuple[str, str, str], PluginInfo] = {}
-        for p in self.plugins:
-            key = (p.name.lower(), p.plugin_type, p.path)
-            if key not in unique:
-                unique[key] = p
-
-        self.plugins = sorted(unique.values(),
-                              key=lambda x: (x.manufacturer.lower(),
-                                             x.name.lower()))
+        self._save_meta_cache()
 
         # Собираем unknown
         self.unknown_plugins = [
@@ -1226,6 +1960,8 @@ class VSTScanner:
 
         print(f"\n✅ Найдено уникальных плагинов: {len(self.plugins)}")
         print(f"❓ Unknown производителей: {len(self.unknown_plugins)}")
+        if errors:
+            print(f"⚠️ Файлов с ошибками обработки: {errors}")
 
     def write_to_txt(self, output_file: str) -> None:
         """Сохраняет результаты в TXT."""
@@ -1299,6 +2035,28 @@ class VSTScanner:
             print(f"     {i:2d}. {mfr:<45} {count:3d}")
 
 
+_worker_scanner: Optional[VSTScanner] = None
+
+
+def _init_worker(db: VSTDatabase, verbose: bool, cache_file: Optional[Path],
+                 meta_cache: Dict[str, Dict[str, str]]) -> None:
+    """Готовит сканер процесса: база и кэш приходят от родителя."""
+    global _worker_scanner
+    # cache_file задаём после конструктора, чтобы не перечитывать файл кэша
+    _worker_scanner = VSTScanner(verbose=verbose, db=db)
+    _worker_scanner.cache_file = cache_file
+    _worker_scanner._meta_cache = meta_cache
+
+
+def _process_in_worker(item: _Candidate
+                       ) -> Tuple[Optional[PluginInfo], Dict[str, Dict[str, str]]]:
+    """Обрабатывает файл в процессе; вместе с результатом отдаёт записи кэша."""
+    scanner = _worker_scanner
+    result = scanner._process_file(item)
+    meta_used, scanner._meta_used = scanner._meta_used, {}
+    return result, meta_used
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="VST Plugin Scanner v7.1")
     parser.add_argument("--output", "-o", default="plugins",
@@ -1308,13 +2066,18 @@ def main() -> None:
     parser.add_argument("--txt", action="store_true", default=True)
     parser.add_argument("--verbose", "-v", action="store_true")
     parser.add_argument("--no-txt", dest="txt", action="store_false")
+    parser.add_argument("--cache", type=Path, default=None,
+                        help="PE metadata cache file (reused between runs)")
     args = parser.parse_args()
 
     print("=" * 80)
     print("🎛️  VST Plugin Scanner v7.1 - Safer Manufacturer Detection")
     print("=" * 80 + "\n")
+    if not PEFILE_AVAILABLE:
+        print("⚠️ pefile не установлен: нестандартные PE-файлы будут пропущены. "
+              "Установите: pip install pefile\n")
 
-    scanner = VSTScanner(verbose=args.verbose)
+    scanner = VSTScanner(verbose=args.verbose, cache_file=args.cache)
     scanner.scan_all_plugins()
 
     base = Path(__file__).parent / args.output